@@ -24,7 +24,15 @@ _test_data = {'topo': os.path.dirname(__file__) +
 _calibration_dir = os.path.dirname(__file__) + '/../notebooks/calibration_files/'
 
 #from .main_thread import MainThread
-from sandbox.sandbox_api import calibrate_projector, calibrate_sensor, start_server
+
+
+def __getattr__(name):
+    # sandbox_api imports panel, which takes seconds. Load it only when its functions are used,
+    # so e.g. the sensor classes can be imported without it
+    if name in ('calibrate_projector', 'calibrate_sensor', 'start_server'):
+        from sandbox import sandbox_api
+        return getattr(sandbox_api, name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 if __name__ == '__main__':
     pass
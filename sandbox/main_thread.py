@@ -2,6 +2,7 @@ from warnings import warn
 import collections
 import numpy
 import threading
+import queue
 import panel as pn
 pn.extension()
 import matplotlib.pyplot as plt
@@ -47,6 +48,10 @@ class MainThread:
         self.lock = threading.Lock()
         self.thread = None
         self.thread_status = 'stopped'  # status: 'stopped', 'running', 'paused'
+        self._stop_event = threading.Event()  # set to end the thread loop, see stop and pause
+        # while the thread runs, the figure is drawn by a second thread, see thread_loop
+        self._draw_queue = queue.Queue(maxsize=1)
+        self._draw_thread = None
 
         # connect to ArucoMarker class
         # if CV2_IMPORT is True:
@@ -126,7 +131,7 @@ class MainThread:
             df = self.Aruco.update()
         else:
             df = pd.DataFrame()
-            plt.pause(0.1)
+            self._stop_event.wait(0.1)  # same delay as before, but returns at once when the thread is stopped
 
         self.sb_params['marker'] = df
 
@@ -135,21 +140,35 @@ class MainThread:
             self.lock.acquire()
             for key in list(self.modules.keys()): #reversed so the contourlines and cmap that were added first, get painted at last
                 self.sb_params = self.modules[key].update(self.sb_params)
+
+            # the limits rarely change, setting them anyway would fire the limit callbacks of the axes on every frame
+            ax = self.sb_params['ax']
+            extent = self.sb_params.get('extent')
+            if ax.get_xlim() != (extent[0], extent[1]):
+                ax.set_xlim(xmin=extent[0], xmax=extent[1])
+            if ax.get_ylim() != (extent[2], extent[3]):
+                ax.set_ylim(ymin=extent[2], ymax=extent[3])
+
+            if isinstance(self.Aruco, MarkerDetection):
+                _ = self.Aruco.plot_aruco(self.sb_params['ax'], self.sb_params['marker'])
             self.lock.release()
         except Exception:
             traceback.print_exc()
             self.lock.release()
             self.thread_status = 'stopped'
-
-        self.sb_params['ax'].set_xlim(xmin=self.sb_params.get('extent')[0], xmax=self.sb_params.get('extent')[1])
-        self.sb_params['ax'].set_ylim(ymin=self.sb_params.get('extent')[2], ymax=self.sb_params.get('extent')[3])
-
-        if isinstance(self.Aruco, MarkerDetection):
-            _ = self.Aruco.plot_aruco(self.sb_params['ax'], self.sb_params['marker'])
-
-        self.lock.acquire()
-        self.projector.trigger()
-        self.lock.release()
+            self._stop_event.set()
+
+        if self._draw_thread is not None:
+            # hand the drawing over to the draw thread and go on with the next frame. If the previous frame is not
+            # drawn yet, it is pending anyway and will show the figure as it is by then
+            try:
+                self._draw_queue.put_nowait(True)
+            except queue.Full:
+                pass
+        else:
+            self.lock.acquire()
+            self.projector.trigger()
+            self.lock.release()
 
     def add_module(self, name: str, module):
         """Add an specific module to run the update in the main thread"""
@@ -182,13 +201,39 @@ class MainThread:
             self._widget_module_selector.value = list(self.modules.keys())
 
     def thread_loop(self):
-        while self.thread_status == 'running':
-            self.update()
+        # drawing the figure takes most of the time of a frame. Do it in a second thread, so the next frame can
+        # already be read from the sensor and the markers searched in the meantime
+        self._draw_thread = threading.Thread(target=self._draw_loop, daemon=True)
+        self._draw_thread.start()
+        try:
+            while not self._stop_event.is_set():
+                self.update()
+        finally:
+            # draw the last frame and end the draw thread. Never block on a draw thread that is not there anymore
+            while self._draw_thread.is_alive():
+                try:
+                    self._draw_queue.put(None, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            self._draw_thread.join()
+            self._draw_thread = None
+
+    def _draw_loop(self):
+        while self._draw_queue.get() is not None:
+            # the modules only change the figure while holding the lock
+            try:
+                with self.lock:
+                    self.projector.trigger()
+            except Exception:
+                # a failed draw must not end the loop, otherwise the next frames are never drawn
+                traceback.print_exc()
 
 
     def run(self):
         if self.thread_status != 'running':
             self.thread_status = 'running'
+            self._stop_event.clear()
             self.thread = threading.Thread(target=self.thread_loop, daemon=True, )
             self.thread.start()
             print('Thread started or resumed...')
@@ -197,7 +242,8 @@ class MainThread:
 
     def stop(self):
         if self.thread_status is not 'stopped':
-            self.thread_status = 'stopped'  # set flag to end thread loop
+            self.thread_status = 'stopped'
+            self._stop_event.set()  # end thread loop
             self.thread.join()  # wait for the thread to finish
             print('Thread stopped.')
         else:
@@ -205,7 +251,8 @@ class MainThread:
 
     def pause(self):
         if self.thread_status == 'running':
-            self.thread_status = 'paused'  # set flag to end thread loop
+            self.thread_status = 'paused'
+            self._stop_event.set()  # end thread loop
             self.thread.join()  # wait for the thread to finish
             print('Thread paused.')
         else:
@@ -2,8 +2,7 @@ from warnings import warn
 import matplotlib.pyplot as plt
 import numpy
 import pandas as pd
-pd.options.mode.chained_assignment = None  # default='warn' # TODO: SettingWithCopyWarning appears when using LoadTopoModule with arucos
-from scipy.spatial.distance import cdist
+from scipy.spatial import cKDTree
 from sandbox.sensor.kinectV2 import KinectV2
 try:
     from pykinect2 import PyKinectV2  # Wrapper for KinectV2 Windows SDK
@@ -95,6 +94,9 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
         #self.load_corners_ids()
 
         self.CoordinateMap = pd.DataFrame()
+        self._color_tree = None  # KD-tree of the color coordinates of the CoordinateMap, see _get_color_tree
+        self._color_tree_map = None
+        self._color_tree_labels = None  # index labels of the points of the KD-tree
         if PYKINECT_INSTALLED and sensor is not None:
             while len(self.CoordinateMap) < 5:
                 self.CoordinateMap = self.create_CoordinateMap()
@@ -141,16 +143,13 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
             frame = self.kinect.get_color()
         corners, ids, rejectedImgPoints = self.aruco_detect(frame)
         if ids is not None:
-            labels = {"ids", "x", "y", "Counter"}
-            df = pd.DataFrame(columns=labels)
-            for j in range(len(ids)):
-                if ids[j] not in df.ids.values:
-                    x_loc, y_loc = self.get_location_marker(corners[j][0])
-                    df_temp = pd.DataFrame(
-                        {"ids": [ids[j][0]], "x": [x_loc], "y": [y_loc]})
-                    df = pd.concat([df, df_temp], sort=False)
-
-            df = df.reset_index(drop=True)
+            # keep the first detection of every id, in the order of detection
+            ids = ids[:, 0]
+            _, first = numpy.unique(ids, return_index=True)
+            first.sort()
+            # middle of the 4 corners of all the markers at once, same as get_location_marker
+            location = numpy.mean(numpy.asarray(corners)[first, 0], axis=1).astype(int)
+            df = pd.DataFrame({"ids": ids[first], "x": location[:, 0], "y": location[:, 1]})
             self.markers_in_frame = self.convert_color_to_depth(None, self.CoordinateMap, data=df)
             self.markers_in_frame.insert(0, 'counter', 0)
             self.markers_in_frame.insert(1, 'box_x', numpy.NaN)
@@ -199,11 +198,10 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
         if len(self.aruco_markers) > 0:
             self.aruco_markers['box_x'] = self.aruco_markers['Depth_x'] - self.calib.s_left
             self.aruco_markers['box_y'] = self.calib.s_height - self.aruco_markers['Depth_y'] - self.calib.s_bottom
-            for j in self.aruco_markers.index:
-                self.aruco_markers['is_inside_box'].loc[j] = self.calib.s_frame_width > (self.aruco_markers['Depth_x'].loc[j] - self.calib.s_left) and \
-                                                  (self.aruco_markers['Depth_x'].loc[j] - self.calib.s_left)> 0 and \
-                                                  (self.calib.s_frame_height > (self.calib.s_height - self.aruco_markers['Depth_y'].loc[j] - self.calib.s_bottom) and \
-                                                  (self.calib.s_height - self.aruco_markers['Depth_y'].loc[j] - self.calib.s_bottom) > 0)
+            box_x = self.aruco_markers['box_x']
+            box_y = self.aruco_markers['box_y']
+            self.aruco_markers['is_inside_box'] = (self.calib.s_frame_width > box_x) & (box_x > 0) & \
+                                                  (self.calib.s_frame_height > box_y) & (box_y > 0)
 
 
     ############### Utilities ########################
@@ -456,6 +454,15 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
         else:
             print('Select Type of projection -> IR, RGB or Projector')
 
+    def _get_color_tree(self, map):
+        """KD-tree of the color coordinates of the map and the index labels of its points, only built again when a
+        new map is passed"""
+        if self._color_tree_map is not map:
+            self._color_tree = cKDTree(map[['Color_x', 'Color_y']].values)
+            self._color_tree_labels = map.index
+            self._color_tree_map = map
+        return self._color_tree, self._color_tree_labels
+
     def convert_color_to_depth(self, ids, map, strg=None, data=None):
         """ Function to search in the previously created CoordinateMap - "create_CoordinateMap()" - the position of any
         detected aruco marker from the color space to the depth space.
@@ -467,7 +474,9 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
             value: Return the line from the CoordinateMap DataFrame showing the equivalence of its position in the color
             space to the depth space
         """
-        color_data = map[['Color_x', 'Color_y']]
+        # nearest neighbour in the color space. The map has a point for every depth pixel, so query a KD-tree
+        # instead of computing and sorting the distances to all of them for every marker
+        tree, labels = self._get_color_tree(map)
         if strg is not None:
             if strg == 'Proj':
                 rgb = self.projector_markers
@@ -480,22 +489,15 @@ class ArucoMarkers(object): # TODO: Include widgets to calibrate arucos
                 x_rgb = int(rgb2.Corners_RGB_x.values)
                 y_rgb = int(rgb2.Corners_RGB_y.values)
 
-            distance = cdist([[x_rgb, y_rgb]], color_data)
-            sorted_val = numpy.argsort(distance)[:][0]
-            value = map.loc[sorted_val[0]]
+            _, index = tree.query([x_rgb, y_rgb])
+            value = map.loc[labels[index]]
 
         else:
             value = pd.DataFrame()
-            if data is not None:
-                for i in range(len(data)):
-                    x_loc = data.loc[i].x
-                    y_loc = data.loc[i].y
-
-                    distance = cdist([[x_loc, y_loc]], color_data)
-                    sorted_val = numpy.argsort(distance)[:][0]
-                    value_i = pd.DataFrame(map.loc[sorted_val[0]]).T
-                    value_i.insert(0, 'ids', data.loc[i].ids)
-                    value = pd.concat([value, value_i], sort=False)
+            if data is not None and len(data) > 0:
+                _, index = tree.query(data[['x', 'y']].values.astype(float))
+                value = map.loc[labels[index]].astype(float)
+                value.insert(0, 'ids', list(data['ids']))
 
         return value
 
@@ -13,6 +13,7 @@ class MarkerDetection: #TODO: include here the connection to the aruco markers
         self.scat = None
         self._scat = None # weak reference to a scat plot
         self._lin = None  # weak reference to a lines plot
+        self._drawn_markers = None  # x, y and color of the markers currently on the plot
         # aruco setup
         self.aruco_connect = True
         self.aruco_scatter = True
@@ -35,24 +36,29 @@ class MarkerDetection: #TODO: include here the connection to the aruco markers
         if self._lin is not None and self._lin() not in ax.lines:
             self.lines = None
         if len(df_position) > 0:
+            # filter the visible markers once and only copy the coordinates, not all the columns of the frame
+            inside = df_position.loc[df_position['is_inside_box'], ['box_x', 'box_y']]
+            x = inside['box_x'].values
+            y = inside['box_y'].values
+            # the markers barely move between frames, only update the artists if the positions or the color changed
+            changed = self._drawn_markers is None or self._drawn_markers[2] != self.aruco_color or \
+                not (numpy.array_equal(self._drawn_markers[0], x) and numpy.array_equal(self._drawn_markers[1], y))
+            self._drawn_markers = (x, y, self.aruco_color)
             if self.aruco_scatter:
                 if self.scat is None:
-                    self.scat = ax.scatter(df_position[df_position['is_inside_box']]['box_x'].values,
-                                           df_position[df_position['is_inside_box']]['box_y'].values,
+                    self.scat = ax.scatter(x, y,
                                            s=350, facecolors='none', edgecolors=self.aruco_color, linewidths=2,
                                            zorder=20)
                     self._scat = weakref.ref(self.scat)
 
-                else:
-                    self.scat.set_offsets(numpy.c_[df_position[df_position['is_inside_box']]['box_x'].values,
-                                                   df_position[df_position['is_inside_box']]['box_y'].values])
+                elif changed:
+                    self.scat.set_offsets(numpy.c_[x, y])
                     self.scat.set_edgecolor(self.aruco_color)
 
                 if self.aruco_annotate:
-                    for i in range(len(df_position[df_position['is_inside_box']])):
-                        ax.annotate(str(df_position[df_position['is_inside_box']].index[i]),
-                                     (df_position[df_position['is_inside_box']]['box_x'].values[i],
-                                     df_position[df_position['is_inside_box']]['box_y'].values[i]),
+                    for marker_id, x_marker, y_marker in zip(inside.index, x, y):
+                        ax.annotate(str(marker_id),
+                                     (x_marker, y_marker),
                                      c=self.aruco_color,
                                      fontsize=20,
                                      textcoords='offset pixels',
@@ -66,16 +72,14 @@ class MarkerDetection: #TODO: include here the connection to the aruco markers
 
             if self.aruco_connect:
                 if self.lines is None:
-                    self.lines, = ax.plot(df_position[df_position['is_inside_box']]['box_x'].values,
-                             df_position[df_position['is_inside_box']]['box_y'].values,
+                    self.lines, = ax.plot(x, y,
                              linestyle='solid',
                              color=self.aruco_color,
                                           zorder = 22)
                     self._lin = weakref.ref(self.lines)
 
-                else:
-                    self.lines.set_data(df_position[df_position['is_inside_box']]['box_x'].values,
-                             df_position[df_position['is_inside_box']]['box_y'].values)
+                elif changed:
+                    self.lines.set_data(x, y)
                     self.lines.set_color(self.aruco_color)
             else:
                 if self.lines is not None: self.lines.remove()
@@ -90,6 +94,7 @@ class MarkerDetection: #TODO: include here the connection to the aruco markers
                 self.scat.remove()
                 self.scat = None
             ax.texts = []
+            self._drawn_markers = None
 
         return ax
 
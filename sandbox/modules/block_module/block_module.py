@@ -1,16 +1,56 @@
+import threading
 import numpy
 import pickle
+import zipfile
 import matplotlib
-import skimage
 import panel as pn
 from sandbox.modules.template import ModuleTemplate
 
+
+_nearest_index_cache = {}  # (input shape, output shape): row and column indices, shared by all the blocks
+
+
+def _nearest_index(src_shape, dst_shape):
+    """Indices of the input rows and columns that contain the centers of the output cells"""
+    key = (tuple(src_shape[:2]), tuple(dst_shape[:2]))
+    if key not in _nearest_index_cache:
+        # the center of output cell i is at (2 * i + 1) * n_in / (2 * n_out) input cells, in integers to get the
+        # cells of centers right on a border the same on every platform
+        _nearest_index_cache[key] = tuple((2 * numpy.arange(n_out, dtype=numpy.intp) + 1) * n_in // (2 * n_out)
+                                          for n_in, n_out in zip(*key))
+    return _nearest_index_cache[key]
+
+
+def _resize_nearest(array, shape):
+    """
+    Nearest neighbour resize of the first two axes of a (height, width[, depth]) array to shape (height, width).
+    Only copies cells and never interpolates. cv2.INTER_NEAREST_EXACT is not used: it is not faster than picking
+    the cells with numpy, and depending on the opencv version it picks other cells for centers on a border
+    """
+    rows, cols = _nearest_index(array.shape, shape)
+    return array[rows[:, None], cols]
+
+
+def _height_to_index(frame, zmin, scale, depth, buffer, out):
+    """
+    Writes the index along z of the block cells at the heights of the frame into out. Heights below zmin or above the
+    top of the blocks are clipped to the first or the last cell, the depth mask hides these cells afterwards
+    """
+    index = numpy.subtract(frame, zmin, out=buffer)
+    numpy.multiply(index, scale, out=index)
+    numpy.rint(index, out=index)  # round to next integer
+    numpy.copyto(out, index, casting='unsafe')
+    numpy.clip(out, 0, depth - 1, out=out)
+    return out
+
+
 class BlockModule(ModuleTemplate):
     # child class of Model
 
     def __init__(self, calibrationdata, sensor, projector, crop=True, **kwarg):
         super().__init__(calibrationdata, sensor, projector, crop, **kwarg)  # call parent init
         self.block_dict = {}
+        self._block_stats = {}  # (min, max) of each block, for the colormaps
         self.cmap_dict = {}
         self.displayed_dataset_key = "mask"  # variable to choose displayed dataset in runtime
         self.rescaled_block_dict = {}
@@ -20,10 +60,14 @@ class BlockModule(ModuleTemplate):
         self.num_contours_reservoir_topo = 10  # number of contours in
         self.reservoir_topography_topo_levels = None  # set in setup and in widget.
         self.result = None  # stores the output array of the current frame
+        self._result_buffer = None
 
         # #rescaled Version of Livecell information. masking has to be done after scaling because the scaling does not support masked arrays
         # self.rescaled_data_mask = None
         self.index = None  # index to find the cells in the rescaled block modules, corresponding to the topography in the sandbox
+        self._index_scale = None
+        self._index_buffer = None
+        self._index_scale_key = None  # (s_min, s_max, depth of the blocks) the scale was computed for
         self.widget = None  # widget to change models in runtime
         self.min_sensor_offset = 0
         self.max_sensor_offset = 0
@@ -33,6 +77,10 @@ class BlockModule(ModuleTemplate):
         self.mask_threshold = 0.5  # set the threshold for the mask array, interpolated between 0.0 and 1.0 #obsolete!
 
         self.num_contour_steps = 20
+        # dragging a slider fires many events, recalculate once it stopped moving for update_delay seconds
+        self.update_delay = 0.1
+        self._contours_timer = None
+        self._contours_lock = threading.Lock()  # the timer thread calculates the levels while update draws them
 
     def setup(self):
         if self.block_dict is None:
@@ -47,12 +95,18 @@ class BlockModule(ModuleTemplate):
 
         self.plot.contours_color = 'w'  # Adjust default contour color
 
-        self.projector.frame.object = self.plot.figure  # Link figure to projector
+        self.projector.figure = self.plot.figure  # Link figure to projector
 
         self.calculate_reservoir_contours()
 
     def update(self):
         # with self.lock:
+        # the widgets change the settings while the thread is running, read them once for a consistent frame
+        key = self.displayed_dataset_key
+        mask_threshold = self.mask_threshold
+        zmin = self.calib.s_min
+        zmax = self.calib.s_max
+
         frame = self.sensor.get_frame()
 
         if self.crop is True:
@@ -76,46 +130,58 @@ class BlockModule(ModuleTemplate):
         #          order=1
         #  )
 
-        if self.displayed_dataset_key is 'mask':  # check if there is a data_mask, TODO: try except key error
-            data = self.rescaled_block_dict[self.displayed_dataset_key]
-        #  data = self.block_dict[self.displayed_dataset_key]
-        else:  # apply data mask
-
-            data = numpy.ma.masked_where(self.rescaled_block_dict['mask'] < self.mask_threshold,
-                                         self.rescaled_block_dict[self.displayed_dataset_key]
-                                         )
-
-        zmin = self.calib.s_min
-        zmax = self.calib.s_max
-
-        index = (frame - zmin) / (zmax - zmin) * (data.shape[2] - 1.0)  # convert the z dimension to index
-        index = index.round()  # round to next integer
-        self.index = index.astype('int')
-
-        # querry the array:
-        i, j = numpy.indices(data[..., 0].shape)  # create arrays with the indices in x and y
-        self.result = data[i, j, self.index]
-
-        self.result = numpy.ma.masked_array(self.result, mask=depth_mask)  # apply the depth mask
+        data = self.rescaled_block_dict[key]
+        #  data = self.block_dict[key]
+        # the data mask is applied below only to the queried cells, not to the whole block on every frame
+        # check if there is a data_mask, TODO: try except key error
+        apply_data_mask = key != 'mask'
+
+        # scale factor from the height to the z index, only recomputed when the sensor range or the model change
+        if self._index_scale_key != (zmin, zmax, data.shape[2]):
+            self._index_scale_key = (zmin, zmax, data.shape[2])
+            self._index_scale = (data.shape[2] - 1.0) / (zmax - zmin)
+        # convert the z dimension to index, in place in buffers reused between the frames
+        dtype = numpy.result_type(frame.dtype, 1.0)
+        if self.index is None or self.index.shape != frame.shape or self._index_buffer.dtype != dtype:
+            self._index_buffer = numpy.empty(frame.shape, dtype=dtype)
+            self.index = numpy.empty(frame.shape, dtype=numpy.int32)
+        _height_to_index(frame, zmin, self._index_scale, data.shape[2], self._index_buffer, self.index)
+
+        # querry the array, picking the cell along z for every x, y without building the index arrays of x and y:
+        result = numpy.take_along_axis(data, self.index[..., None], axis=2)[..., 0]
+
+        # the result is written into a buffer reused between the frames. The masked cells and the cells outside of the
+        # sensor range are set to NaN instead of building a masked array, the colormap shows them with its bad color
+        dtype = numpy.result_type(result.dtype, numpy.float32)  # floating point to hold the NaN
+        if self._result_buffer is None or self._result_buffer.shape != result.shape \
+                or self._result_buffer.dtype != dtype:
+            self._result_buffer = numpy.empty(result.shape, dtype=dtype)
+        numpy.copyto(self._result_buffer, result)
+        if apply_data_mask:
+            data_mask = numpy.take_along_axis(self.rescaled_block_dict['mask'], self.index[..., None], axis=2)[..., 0]
+            self._result_buffer[data_mask < mask_threshold] = numpy.nan
+        self._result_buffer[depth_mask] = numpy.nan  # apply the depth mask
+        self.result = self._result_buffer
 
         self.plot.ax.cla()
 
         self.plot.vmin = zmin
         self.plot.vmax = zmax
-        cmap = self.cmap_dict[self.displayed_dataset_key][0]
+        cmap = self.cmap_dict[key][0]
         cmap.set_over('black')
         cmap.set_under('black')
         cmap.set_bad('black')
 
-        norm = self.cmap_dict[self.displayed_dataset_key][1]
-        min = self.cmap_dict[self.displayed_dataset_key][2]
-        max = self.cmap_dict[self.displayed_dataset_key][3]
+        norm = self.cmap_dict[key][1]
+        min = self.cmap_dict[key][2]
+        max = self.cmap_dict[key][3]
         self.plot.cmap = cmap
         self.plot.norm = norm
         self.plot.render_frame(self.result, contourdata=frame, vmin=min, vmax=max)  # plot the current frame
 
         if self.show_reservoir_topo is True:
-            self.plot.ax.contour(self.rescaled_reservoir_topography, levels=self.reservoir_topography_topo_levels)
+            with self._contours_lock:
+                self.plot.ax.contour(self.rescaled_reservoir_topography, levels=self.reservoir_topography_topo_levels)
         # render and display
         # self.plot.ax.axis([0, self.calib.s_frame_width, 0, self.calib.s_frame_height])
         # self.plot.ax.set_axis_off()
@@ -126,19 +192,25 @@ class BlockModule(ModuleTemplate):
     def load_model(self, model_filename):
         """
         loads a regular grid dataset parsed and prepared with the RMS Grid class.
-        the pickled list contains 2 entries:
-        1.  The regridded Block dictionary
-        2.  a 2d array of the lateral size of the blocks with the z values of the uppermost layer
-            (= the shape of the reservoir top surface)
+        the .npz file contains:
+        1.  The regridded Blocks, stored as 'block_<key>'
+        2.  'reservoir_topography': a 2d array of the lateral size of the blocks with the z values of the
+            uppermost layer (= the shape of the reservoir top surface)
+        Models saved by older versions as a pickled list [block_dict, reservoir_topography] can still be loaded.
         Args:
             model_filename: string with the path to the file to load
 
         Returns: nothing, changes in place the
 
         """
-        data_list = pickle.load(open(model_filename, "rb"))
-        self.block_dict = data_list[0]
-        self.reservoir_topography = data_list[1]
+        if not zipfile.is_zipfile(model_filename):  # legacy pickle
+            with open(model_filename, "rb") as f:
+                self.block_dict, self.reservoir_topography = pickle.load(f)
+        else:
+            with numpy.load(model_filename) as data:
+                self.block_dict = {key[len('block_'):]: data[key] for key in data.files if key.startswith('block_')}
+                self.reservoir_topography = data['reservoir_topography']
+        self._block_stats = {}
         print('Datasets loaded: ', self.block_dict.keys())
 
     def create_cmap(self, clist):
@@ -156,8 +228,10 @@ class BlockModule(ModuleTemplate):
         return norm
 
     def set_colormap(self, key=None, cmap='jet', norm=None):
-        min = numpy.nanmin(self.block_dict[key].ravel())  # find min ignoring NaNs
-        max = numpy.nanmax(self.block_dict[key].ravel())
+        # the blocks do not change once loaded, find their min and max ignoring NaNs only once
+        if key not in self._block_stats:
+            self._block_stats[key] = (numpy.nanmin(self.block_dict[key]), numpy.nanmax(self.block_dict[key]))
+        min, max = self._block_stats[key]
 
         if isinstance(cmap, str):  # get colormap by name
             cmap = matplotlib.cm.get_cmap(name=cmap, lut=None)
@@ -181,31 +255,22 @@ class BlockModule(ModuleTemplate):
 
     def rescale_blocks(self):  # scale the blocks xy Size to the cropped size of the sensor
         for key in self.block_dict.keys():
-            rescaled_block = skimage.transform.resize(
-                self.block_dict[key],
-                (self.calib.s_frame_height, self.calib.s_frame_width),
-                order=0
-            )
-
-            self.rescaled_block_dict[key] = rescaled_block
+            # the rescaled blocks are read on every frame, keep them in single precision (also for older models)
+            self.rescaled_block_dict[key] = _resize_nearest(self.block_dict[key].astype(numpy.float32, copy=False),
+                                                            (self.calib.s_frame_height, self.calib.s_frame_width))
 
         if self.reservoir_topography is not None:  # rescale the topography map
-            self.rescaled_reservoir_topography = skimage.transform.resize(
-                self.reservoir_topography,
-                (self.calib.s_frame_height, self.calib.s_frame_width),
-                order=0  # nearest neighbour
-            )
+            self.rescaled_reservoir_topography = _resize_nearest(self.reservoir_topography,
+                                                                 (self.calib.s_frame_height,
+                                                                  self.calib.s_frame_width))
 
     def rescale_mask(self):  # scale the blocks xy Size to the cropped size of the sensor
-        rescaled_mask = skimage.transform.resize(
-            self.data_mask,
-            (self.calib.s_frame_height, self.calib.s_frame_width),
-            order=0
-        )
+        rescaled_mask = _resize_nearest(self.data_mask, (self.calib.s_frame_height, self.calib.s_frame_width))
         self.rescaled_data_mask = rescaled_mask
 
     def clear_models(self):
         self.block_dict = {}
+        self._block_stats = {}
 
     def clear_rescaled_models(self):
         self.rescaled_block_dict = {}
@@ -239,9 +304,7 @@ class BlockModule(ModuleTemplate):
         :return:
         """
         # used to be with self.lock:
-        self.pause()
         self.mask_threshold = event.new
-        self.resume()
 
     def show_widgets(self):
         self.original_sensor_min = self.calib.s_min  # store original sensor values on start
@@ -282,9 +345,7 @@ class BlockModule(ModuleTemplate):
         :return:
         """
         # used to be with self.lock:
-        self.pause()
         self.displayed_dataset_key = event.new
-        self.resume()
 
     def _widget_sensor_top_slider(self):
         """
@@ -295,7 +356,7 @@ class BlockModule(ModuleTemplate):
         pn.extension()
         widget = pn.widgets.IntSlider(name='offset top of the model ', start=-250, end=250, step=1, value=0)
 
-        widget.param.watch(self._callback_top_slider, 'value', onlychanged=False)
+        widget.param.watch(self._callback_top_slider, 'value')
 
         return widget
 
@@ -305,10 +366,8 @@ class BlockModule(ModuleTemplate):
         :return:
         """
         # used to be with self.lock:
-        self.pause()
         self.min_sensor_offset = event.new
         self._update_sensor_calib()
-        self.resume()
 
     def _widget_sensor_bottom_slider(self):
         """
@@ -319,7 +378,7 @@ class BlockModule(ModuleTemplate):
         pn.extension()
         widget = pn.widgets.IntSlider(name='offset bottom of the model ', start=-250, end=250, step=1, value=0)
 
-        widget.param.watch(self._callback_bottom_slider, 'value', onlychanged=False)
+        widget.param.watch(self._callback_bottom_slider, 'value')
 
         return widget
 
@@ -329,10 +388,8 @@ class BlockModule(ModuleTemplate):
         :return:
         """
         # used to be with self.lock:
-        self.pause()
         self.max_sensor_offset = event.new
         self._update_sensor_calib()
-        self.resume()
 
     def _widget_sensor_position_slider(self):
         """
@@ -344,7 +401,7 @@ class BlockModule(ModuleTemplate):
         widget = pn.widgets.IntSlider(name='offset the model in vertical direction ', start=-250, end=250, step=1,
                                       value=0)
 
-        widget.param.watch(self._callback_position_slider, 'value', onlychanged=False)
+        widget.param.watch(self._callback_position_slider, 'value')
 
         return widget
 
@@ -354,14 +411,13 @@ class BlockModule(ModuleTemplate):
         :return:
         """
         # used to be with self.lock:
-        self.pause()
         self.minmax_sensor_offset = event.new
         self._update_sensor_calib()
-        self.resume()
 
     def _update_sensor_calib(self):
-        self.calib.s_min = self.original_sensor_min + self.min_sensor_offset + self.minmax_sensor_offset
-        self.calib.s_max = self.original_sensor_max + self.max_sensor_offset + self.minmax_sensor_offset
+        s_min = self.original_sensor_min + self.min_sensor_offset + self.minmax_sensor_offset
+        s_max = self.original_sensor_max + self.max_sensor_offset + self.minmax_sensor_offset
+        self.calib.s_min, self.calib.s_max = s_min, s_max
 
     def _widget_show_reservoir_topography(self):
         widget = pn.widgets.Toggle(name='show reservoir top contours',
@@ -372,10 +428,8 @@ class BlockModule(ModuleTemplate):
         return widget
 
     def _callback_show_reservoir_topography(self, event):
-        self.pause()
         self.show_reservoir_topo = event.new
         self._update_sensor_calib()
-        self.resume()
 
     def _widget_reservoir_contours_num(self):
         """ Shows a widget that allows to change the contours step size"""
@@ -386,14 +440,31 @@ class BlockModule(ModuleTemplate):
                                       step=1,
                                       value=round(self.num_contours_reservoir_topo))
 
-        widget.param.watch(self._callback_reservoir_contours_num, 'value', onlychanged=False)
+        widget.param.watch(self._callback_reservoir_contours_num, 'value')
         return widget
 
     def _callback_reservoir_contours_num(self, event):
-        self.pause()
         self.num_contours_reservoir_topo = event.new
-        self.calculate_reservoir_contours()
-        self.resume()
+        self._request_reservoir_contours()
+
+    def _request_reservoir_contours(self):
+        """Debounced calculate_reservoir_contours: restarts the countdown on every call, so dragging the slider
+        calculates the levels only once it stopped moving"""
+        if self._contours_timer is not None:
+            self._contours_timer.cancel()
+        self._contours_timer = threading.Timer(self.update_delay, self._locked_reservoir_contours)
+        self._contours_timer.daemon = True
+        self._contours_timer.start()
+
+    def _locked_reservoir_contours(self):
+        with self._contours_lock:
+            self.calculate_reservoir_contours()
+
+    def close(self):
+        """Cancel a pending recalculation of the reservoir contours"""
+        if self._contours_timer is not None:
+            self._contours_timer.cancel()
+            self._contours_timer = None
 
     def _widget_contours_num(self):
         """ Shows a widget that allows to change the contours step size"""
@@ -404,13 +475,11 @@ class BlockModule(ModuleTemplate):
                                       step=1,
                                       value=self.num_contour_steps)
 
-        widget.param.watch(self._callback_contours_num, 'value', onlychanged=False)
+        widget.param.watch(self._callback_contours_num, 'value')
         return widget
 
     def _callback_contours_num(self, event):
-        self.pause()
         self.plot.vmin = self.calib.s_min
         self.plot.vmax = self.calib.s_max
         self.num_contour_steps = event.new
         self.plot.contours_step = (self.plot.vmax - self.plot.vmin) / float(self.num_contour_steps)
-        self.resume()
@@ -1,6 +1,10 @@
+import os
+from warnings import warn
+from concurrent.futures import ThreadPoolExecutor
 import numpy
 import scipy
-import pickle
+import scipy.interpolate
+import scipy.spatial
 
 class RMS_Grid():
 
@@ -22,6 +26,7 @@ class RMS_Grid():
         self.reservoir_topography = None
         self.method = 'nearest'
         self.mask_method = 'nearest'
+        self.n_workers = min(4, os.cpu_count() or 1)  # threads to regrid the datasets in parallel
 
     def load_model_vip(self, infile):
         # parse the file
@@ -87,36 +92,38 @@ class RMS_Grid():
             for i in range(3):  # skip Layer(nz)
                 f.readline()
 
+            # only collect the corner lines of the layer here, the values are converted all at once below
+            corners = []
             for y in range(ny):
                 # print(y)
                 for x in range(nx):
 
                     # skip cell header (each cell)
-                    l = f.readline().split()
-                    while l[0] == 'C':  # skip header
-                        l = f.readline().split()
+                    text = f.readline()
+                    while text.split(None, 1)[0] == 'C':  # skip header
+                        text = f.readline()
 
-                    px = []
-                    py = []
-                    pz = []
                     for i in range(4):
-                        # read the corner points
-                        px.append(float(l[0]))
-                        py.append(float(l[1]))
-                        pz.append(float(l[2]))
-
-                        px.append(float(l[3]))
-                        py.append(float(l[4]))
-                        pz.append(float(l[5]))
-                        l = f.readline().split()  # read in next line
-
-                    # calculate the arithmetic mean of all 4 corners elementwise:
-                    self.coords_x[x, y, z] = numpy.mean(numpy.array(px))
-                    self.coords_y[x, y, z] = numpy.mean(numpy.array(py))
-                    self.coords_z[x, y, z] = numpy.mean(numpy.array(pz))
+                        # read the corner points, 2 corners (x, y, z) per line
+                        corners.append(text)
+                        text = f.readline()  # read in next line
+
+            # the corner lines are converted by numpy in one go, unless one of them does not hold exactly 6 values
+            try:
+                values = numpy.array(' '.join(corners).split(), dtype=float)
+            except ValueError:
+                values = None
+            if values is None or values.size != ny * nx * 24:
+                values = numpy.array([text.split()[:6] for text in corners], dtype=float)
+
+            # calculate the arithmetic mean of all 4 corners elementwise, for all the cells of the layer:
+            # (xyz, nx, ny, 8 corners), the corners of a cell next to each other as in the mean of a single cell
+            corners = values.reshape(ny, nx, 8, 3)
+            corners = numpy.ascontiguousarray(corners.transpose(3, 1, 0, 2))
+            self.coords_x[:, :, z], self.coords_y[:, :, z], self.coords_z[:, :, z] = corners.mean(axis=-1)
 
     def parse_livecells_vip(self, current_file, nx, ny, nz):
-        data_np = numpy.empty((nx, ny, nz))
+        data_np = numpy.empty((nx, ny, nz), dtype=numpy.uint8)  # live cells are only 0 or 1
 
         # store pointer position to come back to after the values per line were determined
         pointer = current_file.tell()
@@ -126,28 +133,26 @@ class RMS_Grid():
         current_file.seek(pointer)  # go back to pointer position
 
         for z in range(nz):
+            rows = []  # values of the layer, converted all at once below
             for y in range(ny):
-                x = 0
+                row = []
                 for n in range(nx // values_per_line):  # read values in full lines
                     l = current_file.readline().split()
                     if len(l) < values_per_line:  # if there is an empty line, skip to the next
                         l = current_file.readline().split()
-                    for i in range(values_per_line):  # iterate values in the line
-                        value = l[i]
-                        data_np[x, y, z] = float(value)
-                        x = x + 1  # iterate x
+                    row.extend(l[:values_per_line])  # iterate values in the line
 
                 if nx % values_per_line > 0:
                     l = current_file.readline().split()
-                    for i in range(nx % values_per_line):  # read values in the last not full line
-                        value = l[i]
-                        data_np[x, y, z] = float(value)
-                        x = x + 1
+                    row.extend(l[:nx % values_per_line])  # read values in the last not full line
+                rows.append(row)
+            data_np[:, :, z] = numpy.array(rows, dtype=float).T
 
         self.block_dict['mask'] = data_np
 
     def parse_block_vip(self, current_file, value_dict, key, nx, ny, nz):
-        data_np = numpy.empty((nx, ny, nz))
+        # single precision is plenty for the reservoir properties and halves the memory of the blocks
+        data_np = numpy.empty((nx, ny, nz), dtype=numpy.float32)
 
         f = current_file
 
@@ -168,26 +173,36 @@ class RMS_Grid():
         for z in range(nz):
             for i in range(3):
                 l = f.readline().split()
+            # collect the lines of the layer and let numpy convert them all at once. Only the lines that can be
+            # empty or a header are split to check them, the data lines are kept as they are
+            lines = []
             for y in range(ny):
-                x = 0
-
                 for line in range(blocklength):
-                    l = f.readline().split()
-                    if len(l) < 1:
-                        l = f.readline().split()  # skip empty line that occurs if value is dividable by 8
-                    while l[0] == "C":
-                        l = f.readline().split()  # skip the header lines(can vary from file to file)
-                    for i in range(len(l)):
+                    text = f.readline()
+                    if 'C' in text or not text.strip():
+                        l = text.split()
+                        if len(l) < 1:
+                            text = f.readline()  # skip empty line that occurs if value is dividable by 8
+                            l = text.split()
+                        while l[0] == "C":
+                            text = f.readline()  # skip the header lines(can vary from file to file)
+                            l = text.split()
+                    lines.append(text)
+            try:
+                values = numpy.array(' '.join(lines).split(), dtype=float)
+            except ValueError:
+                values = None  # invalid values are reported below
+            if values is not None and values.size == nx * ny:
+                data_np[:, :, z] = values.reshape(ny, nx).T
+            else:
+                # go value by value to report which ones are not valid
+                for y in range(ny):
+                    row = ' '.join(lines[y * blocklength:(y + 1) * blocklength]).split()
+                    for x, value in enumerate(row):
                         try:
-                            value = l[i]
-                            # data.loc[x,y,z] = value
-                            # values.append(value)
                             data_np[x, y, z] = float(value)
-                            x = x + 1
-                        except:
-                            print('failed to parse value ', x, y, z)
-                            print(l)
-                            x = x + 1
+                        except ValueError:
+                            warn('failed to parse value ' + repr(value) + ' of cell ' + str((x, y, z)) + ' in ' + key)
         # print(x, y + 1, z + 1)  # to check if all cells are loaded
 
         print(key + ' loaded')
@@ -219,13 +234,12 @@ class RMS_Grid():
 
         grid = numpy.stack((a.ravel(), b.ravel(), c.ravel()), axis=1)
 
-        # iterate over all loaded datasets:
+        # iterate over all loaded datasets and prepare their data:
+        jobs = {}
         for key in self.block_dict.keys():
-            print("processing grid: ", key)
             if key == 'mask':
-                self.block_dict[key][:, :, 0] = 0.0
-                self.block_dict[key][0, :,
-                :] = 0.0  # exchange outer limits of the box so that nearest neighbour returns zeros outside the box
+                # exchange outer limits of the box so that nearest neighbour returns zeros outside the box
+                self.block_dict[key][0, :, :] = 0.0
                 self.block_dict[key][-1, :, :] = 0.0
                 self.block_dict[key][:, -1, :] = 0.0
                 self.block_dict[key][:, 0, :] = 0.0
@@ -237,22 +251,44 @@ class RMS_Grid():
             if key == 'mask':  # for the mask, fill NaN values with 0.0
                 if mask_method == None:
                     mask_method = self.mask_method  # 'linear' or 'nearest'
-                data = numpy.nan_to_num(data)  # this does not work with nearest neighbour!
-
-                interp_grid = scipy.interpolate.griddata((x, y, z), data, grid, method=mask_method)
+                if data.dtype.kind == 'f':  # the live cells parsed from the file are integers and have no NaN
+                    data = numpy.nan_to_num(data)  # this does not work with nearest neighbour!
+                jobs[key] = (data, mask_method)
 
             else:
                 if method == None:
                     method = self.method
-                interp_grid = scipy.interpolate.griddata((x, y, z), data, grid, method=method)
-
-            # save to dictionary:
-            # reshape to originasl dimension BUT WITH X AND Y EXCHANGEND
-            self.regular_grid_dict[key] = interp_grid.reshape([self.regriding_resolution[1],
-                                                               self.regriding_resolution[0],
-                                                               self.regriding_resolution[2]]
-                                                              )
-            print("done!")
+                jobs[key] = (data, method)
+
+        # all the datasets are defined on the same cells, so the nearest cell of every grid point and the
+        # triangulation of the cells are only computed once and reused for every dataset
+        points = numpy.stack((x, y, z), axis=1)
+        interpolation = {}
+        methods = {job[1] for job in jobs.values()}
+        if 'nearest' in methods:
+            _, interpolation['nearest'] = scipy.spatial.cKDTree(points).query(grid)
+        if 'linear' in methods:
+            interpolation['linear'] = scipy.spatial.Delaunay(points)
+
+        def interpolate(job):
+            data, method = job
+            if method == 'nearest':
+                return data[interpolation['nearest']]
+            elif method == 'linear':
+                return scipy.interpolate.LinearNDInterpolator(interpolation['linear'], data)(grid)
+            return scipy.interpolate.griddata((x, y, z), data, grid, method=method)
+
+        # the datasets are independent, interpolate them in parallel threads. scipy evaluates the linear and griddata
+        # interpolation without holding the GIL. A process pool would copy the grid and triangulation to each worker
+        with ThreadPoolExecutor(self.n_workers) as executor:
+            for key, interp_grid in zip(jobs.keys(), executor.map(interpolate, jobs.values())):
+                print("processing grid: ", key)
+                # save to dictionary:
+                # reshape to originasl dimension BUT WITH X AND Y EXCHANGEND
+                # in single precision, the blocks are read on every frame of the BlockModule
+                self.regular_grid_dict[key] = interp_grid.astype(numpy.float32, copy=False).reshape(
+                    [self.regriding_resolution[1], self.regriding_resolution[0], self.regriding_resolution[2]])
+                print("done!")
 
     def create_reservoir_topo(self):
         """
@@ -283,13 +319,23 @@ class RMS_Grid():
         topo = scipy.interpolate.griddata((top_x, top_y), top_z, grid2d)  # this has to be done with the linear method!
         self.reservoir_topography = topo.reshape([self.regriding_resolution[1], self.regriding_resolution[0]])
 
-    def save(self, filename):
+    def save(self, filename, compress=True):
         """
-    saves a list with two entries to a pickle:
+    saves the model to a .npz file:
 
-        [0] the regridded data blocks in a dictionary
-        [1] the reservoir topography map
+        block_<key>: the regridded data blocks, one array per key of the dictionary
+        reservoir_topography: the reservoir topography map
+
+        compress: deflate the arrays. Set to False for a larger file that loads faster, as the arrays
+        are then read without decompressing. BlockModule.load_model reads both.
 
         """
-        pickle.dump([self.regular_grid_dict, self.reservoir_topography], open(filename, "wb"))
+        blocks = {'block_' + key: value for key, value in self.regular_grid_dict.items()}
+        # write through the file object, numpy would append .npz to a filename without it and
+        # BlockModule.load_model would not find the model under the given name
+        with open(filename, 'wb') as f:
+            if compress:
+                numpy.savez_compressed(f, reservoir_topography=self.reservoir_topography, **blocks)
+            else:
+                numpy.savez(f, reservoir_topography=self.reservoir_topography, **blocks)
 
@@ -1,8 +1,8 @@
 from warnings import warn
 import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
 import numpy
 import pandas as pd
-pd.options.mode.chained_assignment = None  # default='warn' # TODO: SettingWithCopyWarning appears when using LoadTopoModule with arucos
 import panel as pn
 pn.extension('vtk')
 import pyvista as pv
@@ -62,6 +62,7 @@ class GemPyModule(ModuleTemplate):
         self.vmin = None
         self.vmax = None
         self.cmap = None
+        self._cmap_colors = None  # surface colors self.cmap was built from
         self.grid = None
         self.plot_topography = True
         self.plot_faults = True
@@ -143,10 +144,9 @@ class GemPyModule(ModuleTemplate):
         self.geo_model._grid.topography.extent = self.grid.model_extent[:4]
         self.geo_model._grid.topography.resolution = numpy.asarray((self.grid.sensor_extent[3], self.grid.sensor_extent[1]))
         self.geo_model._grid.topography.values = self.grid.depth_grid
-        self.geo_model._grid.topography.values_2d = numpy.dstack(
-            [self.grid.depth_grid[:, 0].reshape(self.grid.sensor_extent[3], self.grid.sensor_extent[1]),
-             self.grid.depth_grid[:, 1].reshape(self.grid.sensor_extent[3], self.grid.sensor_extent[1]),
-             self.grid.depth_grid[:, 2].reshape(self.grid.sensor_extent[3], self.grid.sensor_extent[1])])
+        # (x, y, z) columns of the depth grid as a (height, width, 3) array; copied since update() writes into it
+        self.geo_model._grid.topography.values_2d = self.grid.depth_grid.reshape(
+            self.grid.sensor_extent[3], self.grid.sensor_extent[1], 3).copy()
 
         self.geo_model._grid.set_active('topography')
         self.geo_model.update_from_grid()
@@ -186,7 +186,12 @@ class GemPyModule(ModuleTemplate):
         return sb_params
 
     def plot(self, ax, geo_model):
-        ax, cmap = plot_gempy(ax, geo_model)
+        # the surface colors rarely change, only build a new colormap when they do
+        colors = tuple(geo_model.surfaces.df['color'])
+        if colors != self._cmap_colors:
+            self.cmap = mcolors.ListedColormap(list(colors))
+            self._cmap_colors = colors
+        ax, cmap = plot_gempy(ax, geo_model, cmap=self.cmap)
         return ax, cmap
 
     def change_model(self, geo_model):
@@ -216,22 +221,18 @@ class GemPyModule(ModuleTemplate):
         """
         df = marker.copy()
         if len(df) > 0:
-            df = df.loc[df.is_inside_box, ('box_x', 'box_y', 'is_inside_box')]
+            df = df.loc[df.is_inside_box, ('box_x', 'box_y', 'is_inside_box')].copy()  # a new frame, not a slice
             #df['box_z'] = self.Aruco.aruco_markers.loc[self.Aruco.aruco_markers.is_inside_box, ['Depth_Z(mm)']]
-            df['box_z'] = numpy.nan
             # depth is changing all the time so the coordinate map method becomes old.
             # Workaround: just replace the value from the actual frame
             frame = self.frame
-            for i in df.index:
-                df.at[i, 'box_z'] = self.grid.scale_frame(frame[int(df.at[i, 'box_y'])][(int(df.at[i, 'box_x']))])
-                    #self._model_extent[5] -
-                    #                 ((frame[int(df.at[i, 'box_x'])][(int(df.at[i, 'box_y']))] - self._sensor_extent[-2]) /
-                    #                  (self._sensor_extent[-1]- self._sensor_extent[-2]) *
-                    #                  (self._model_extent[5] - self._model_extent[4])))
-                #the combination below works though it should not! Look into scale again!!
-                #pixel scale and pixel size should be consistent!
-                df.at[i, 'box_x'] = (self._pixel_size[0]*marker['box_x'][i])
-                df.at[i, 'box_y'] = (self._pixel_scale[1]*marker['box_y'][i])
+            # all the markers at once: the frame values under the markers, then the scaled positions
+            df['box_z'] = self.grid.scale_frame(frame[df['box_y'].to_numpy().astype(int),
+                                                      df['box_x'].to_numpy().astype(int)])
+            #the combination below works though it should not! Look into scale again!!
+            #pixel scale and pixel size should be consistent!
+            df['box_x'] = self._pixel_size[0] * df['box_x']
+            df['box_y'] = self._pixel_scale[1] * df['box_y']
 
         return df
 
@@ -2,17 +2,23 @@ import numpy
 import matplotlib.colors as mcolors
 import matplotlib
 
-def plot_gempy(ax, geo_model):
+# since matplotlib 3.6 the contours are computed by contourpy, whose 'serial' algorithm is faster than the default
+_CONTOUR_KWARGS = {'algorithm': 'serial'} \
+    if tuple(int(v) for v in matplotlib.__version__.split('.')[:2]) >= (3, 6) else {}
+
+def plot_gempy(ax, geo_model, cmap=None):
     """
     Plot the geological map of the sandbox in the axes
     Args:
         ax: axes to the figure to plot
         geo_model: gempy model
+        cmap: colormap of the surfaces of the model. Built from the surface colors if None
     Returns:
         Painted axes
 
     """
-    cmap = mcolors.ListedColormap(list(geo_model.surfaces.df['color']))
+    if cmap is None:
+        cmap = mcolors.ListedColormap(list(geo_model.surfaces.df['color']))
     ax = delete_ax(ax)
     ax = add_faults(ax, geo_model, cmap)
     ax = add_lith(ax, geo_model, cmap)
@@ -54,27 +60,34 @@ def extract_boundaries(ax, geo_model, cmap, e_faults=False, e_lith=False):
     else:
         raise AttributeError
 
-    for f_id in counters:
-        block = a[f_id]
-        level = geo_model.solutions.scalar_field_at_surface_points[f_id][numpy.where(
-            geo_model.solutions.scalar_field_at_surface_points[f_id] != 0)]
+    # reshape the blocks and select the surface levels of all the ids at once, the loop only builds the levels and draws
+    blocks = a.reshape((counter,) + tuple(shape))
+    scalar = geo_model.solutions.scalar_field_at_surface_points
+    surface_levels = [scalar[f_id][scalar[f_id] != 0] for f_id in counters]
+    last = counters[-1] if len(counters) > 0 else None
+    # counters is a range of ids, so the maxima of all its blocks come from a single reduction over a slice
+    blocks_max = blocks[counters[0]:last + 1].max(axis=(1, 2)) if len(counters) > 0 else []
+    colors = cmap.colors  # surface colors of the model, hex strings for gempy
 
-        levels = numpy.insert(level, 0, block.max())
-        c_id2 = c_id + len(level)
-        if f_id == counters.max():
-            levels = numpy.insert(levels, level.shape[0], block.min())
+    for f_id, level, block_max in zip(counters, surface_levels, blocks_max):
+        block = blocks[f_id]
+        if f_id == last:
+            levels = numpy.concatenate(([block_max], level, [block.min()]))
             c_id2 = c_id + len(levels)  # color id endpoint
-        block = block.reshape(shape)
+        else:
+            levels = numpy.concatenate(([block_max], level))
+            c_id2 = c_id + len(level)
+        levels.sort()
         zorder = zorder - (f_id + len(level))
 
         if f_id >= len(faults):
-            fill = ax.contourf(block, 0, levels=numpy.sort(levels), colors=cmap.colors[c_id:c_id2][::-1],
+            fill = ax.contourf(block, 0, levels=levels, colors=colors[c_id:c_id2][::-1],
                              linestyles='solid', origin='lower',
-                             extent=extent, zorder=zorder)
+                             extent=extent, zorder=zorder, **_CONTOUR_KWARGS)
         else:
-            fau = ax.contour(block, 0, levels=numpy.sort(levels), colors=cmap.colors[c_id:c_id2][0],
+            fau = ax.contour(block, 0, levels=levels, colors=colors[c_id],
                             linestyles='solid', origin='lower',
-                            extent=extent, zorder=zorder)
+                            extent=extent, zorder=zorder, **_CONTOUR_KWARGS)
         c_id += len(level)
 
     return ax
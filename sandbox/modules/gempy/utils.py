@@ -15,30 +15,26 @@ def get_scale(physical_extent: list, model_extent: list, sensor_extent: list, xy
     Returns:
         scale in model units, pixel_scale [modelunits/pixel], pixel_size [mm/pixel]
     """
-    scale = [None, None, None]
-    pixel_size = [None, None]
-    pixel_scale = [None, None]
+    # [[x_lo, x_hi], [y_lo, y_hi], [z_lo, z_hi]]
+    model_extent = numpy.asarray(model_extent, dtype=float).reshape(3, 2)
+    sensor_extent = numpy.asarray(sensor_extent, dtype=float).reshape(3, 2)
+    model_span = model_extent[:, 1] - model_extent[:, 0]
 
-    pixel_scale[0] = float(model_extent[1] - model_extent[0]) / float(sensor_extent[1])
-    pixel_scale[1] = float(model_extent[3] - model_extent[2]) / float(sensor_extent[3])
-
-    pixel_size[0] = float(physical_extent[0]) / float(sensor_extent[1])
-    pixel_size[1] = float(physical_extent[1]) / float(sensor_extent[3])
+    pixel_scale = (model_span[:2] / sensor_extent[:2, 1]).tolist()
+    pixel_size = (numpy.asarray(physical_extent, dtype=float) / sensor_extent[:2, 1]).tolist()
 
     # TODO: change the extent in place!! or create a new extent object that stores the extent after that modification.
     if xy_isometric:  # model is extended in one horizontal direction to fit  into box while the scale
         # in both directions is maintained
         print("Aspect ratio of the model is fixed in XY")
         if pixel_scale[0] >= pixel_scale[1]:
-            pixel_scale[1] = pixel_scale[0]
             print("Model size is limited by X dimension")
         else:
-            pixel_scale[0] = pixel_scale[1]
             print("Model size is limited by Y dimension")
+        pixel_scale = [max(pixel_scale)] * 2
 
-    scale[0] = pixel_scale[0] / pixel_size[0]
-    scale[1] = pixel_scale[1] / pixel_size[1]
-    scale[2] = float(model_extent[5] - model_extent[4]) / (sensor_extent[5] - sensor_extent[4])
+    scale = numpy.append(numpy.divide(pixel_scale, pixel_size),
+                         model_span[2] / (sensor_extent[2, 1] - sensor_extent[2, 0])).tolist()
     print("scale in Model units/ mm (X,Y,Z): " + str(scale))
     return scale, pixel_scale, pixel_size
 
@@ -80,7 +76,12 @@ class Grid(object):
         width = numpy.linspace(self.model_extent[0], self.model_extent[1], self.sensor_extent[1])
         height = numpy.linspace(self.model_extent[2], self.model_extent[3], self.sensor_extent[3])
         xx, yy = numpy.meshgrid(width, height)
-        self.empty_depth_grid = numpy.vstack([xx.ravel(), yy.ravel()]).T
+        # (N, 2) C-contiguous, the transpose of vstack was a column-major view. Stays float64 since gempy concatenates
+        # the topography with its float64 grids
+        self.empty_depth_grid = numpy.column_stack((xx.ravel(), yy.ravel()))
+        # the xy columns only change with the extents, so update_grid just writes the z column of this array
+        self.depth_grid = numpy.zeros((self.empty_depth_grid.shape[0], 3))
+        self.depth_grid[:, :2] = self.empty_depth_grid
 
         print("the shown extent is [" + str(self.empty_depth_grid[0, 0]) + ", " +
               str(self.empty_depth_grid[-1, 0]) + ", " +
@@ -101,7 +102,7 @@ class Grid(object):
     def update_grid(self, scale_frame):
         """
         The frame that is passed here is cropped and clipped
-        Appends the z (depth) coordinate to the empty depth grid.
+        Writes the z (depth) coordinate into the depth grid, whose xy columns are set in create_empty_depth_grid.
         this has to be done every frame while the xy coordinates only change if the calibration or model extent is changed.
         For performance reasons these steps are therefore separated.
 
@@ -110,7 +111,4 @@ class Grid(object):
 
         Returns:
         """
-        flattened_depth = scale_frame.ravel()
-        depth_grid = numpy.c_[self.empty_depth_grid, flattened_depth]
-
-        self.depth_grid = depth_grid
+        self.depth_grid[:, 2] = scale_frame.ravel()
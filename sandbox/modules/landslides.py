@@ -25,6 +25,8 @@ class LandslideSimulation(ModuleTemplate):
         self.release_area_all = None
         self._patch = None
         self._lan = None
+        self._lan_flow = None  # flow array, frame index and box extent currently shown by self._lan
+        self._lan_key = None
 
         self._start = None #For the real time simulations
         self._end = None
@@ -71,7 +73,8 @@ class LandslideSimulation(ModuleTemplate):
 
     def plot(self, frame, ax):
         self.delete_polygon()
-        self.delete_land()
+        if self._lan is not None and self._lan not in ax.images:  # removed from the axes in the meantime
+            self._lan = None
         if self.box_release_area:
             self.show_box_release(ax, self.release_area)
         self.plot_landslide_frame(ax)
@@ -85,6 +88,33 @@ class LandslideSimulation(ModuleTemplate):
         if self._lan is not None:
             self._lan.remove()
             self._lan = None
+        self._lan_flow = None
+        self._lan_key = None
+
+    def show_flow_frame(self, ax, flow, index):
+        """
+        Show the frame index of the flow simulation in the box area. Most of the time the simulation frame does not
+        change between two sandbox frames, so the frame is only rounded, masked and set to the image when it changed
+        Args:
+            ax: axes to plot the frame
+            flow: height_flow or velocity_flow
+            index: simulation frame to show
+        Returns:
+        """
+        extent = self.Load_Area.to_box_extent
+        if self._lan is not None and flow is self._lan_flow and (index, extent) == self._lan_key:
+            return
+        self._lan_flow = flow
+        self._lan_key = (index, extent)
+        move = numpy.round(flow[..., index], decimals=1)
+        move = numpy.ma.masked_where(move <= 0, move)
+        if self._lan is None:
+            self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
+                                  extent=extent, zorder=10)
+        else:
+            self._lan.set_data(move)
+            self._lan.set_extent(extent)
+            self._lan.autoscale()
 
     def plot_landslide_frame(self, ax):
         """
@@ -114,16 +144,9 @@ class LandslideSimulation(ModuleTemplate):
             if self.height_flow is None:
                 return
             if self.running_simulation:
-                move = self.height_flow[..., self.simulation_frame]
+                self.show_flow_frame(ax, self.height_flow, self.simulation_frame)
             else:
-                move = self.height_flow[..., self.frame_selector]
-            move = numpy.round(move, decimals=1)
-            move = numpy.ma.masked_where(move <= 0, move)
-            if self._lan is None:
-                self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
-                                      extent=self.Load_Area.to_box_extent, zorder=10)
-            else:
-                self._lan.set_data(move)
+                self.show_flow_frame(ax, self.height_flow, self.frame_selector)
 
             #move = self.Load_Area.modify_to_box_coordinates(move)
             #self._lan = ax.pcolormesh(move, cmap='hot', shading='gouraud')
@@ -132,21 +155,12 @@ class LandslideSimulation(ModuleTemplate):
             if self.velocity_flow is None:
                 return
             if self.running_simulation:
-                move = self.velocity_flow[..., self.simulation_frame]
-            else:
-                move = self.velocity_flow[..., self.frame_selector]
-            move = numpy.round(move, decimals=1)
-            move = numpy.ma.masked_where(move <= 0, move)
-            if self._lan is None:
-                self._lan = ax.imshow(move, cmap='hot', aspect='auto', origin='lower',
-                                      extent=self.Load_Area.to_box_extent, zorder=10)
+                self.show_flow_frame(ax, self.velocity_flow, self.simulation_frame)
             else:
-                self._lan.set_data(move)
+                self.show_flow_frame(ax, self.velocity_flow, self.frame_selector)
 
         else:
-            if self._lan is not None:
-                self._lan.remove()
-                self._lan = None
+            self.delete_land()
             #move = numpy.round(move, decimals=1)
             #move[move == 0] = numpy.nan
             #move = self.Load_Area.modify_to_box_coordinates(move)
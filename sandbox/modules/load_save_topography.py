@@ -72,6 +72,7 @@ class LoadSaveTopoModule(ModuleTemplate):
 
         #Stores the axes
         self._lod = None
+        self._lod_show = None  # representation currently shown by self._lod
         #self._dif = None
         return print("LoadSaveTopoModule loaded succesfully")
 
@@ -105,7 +106,12 @@ class LoadSaveTopoModule(ModuleTemplate):
 
     def plot(self, frame, ax):
         self.delete_rectangles_ax(ax)
-        self.delete_im_ax(ax)
+        # the image of the previous frame is updated in place, only create a new one if the representation changed
+        if self._lod is not None and self._lod not in ax.images:  # removed from the axes in the meantime
+            self._lod = None
+        if self.current_show != self._lod_show:
+            self.delete_im_ax(ax)
+            self._lod_show = self.current_show
         if self.current_show == self.difference_types[0]:
             self.delete_im_ax(ax)
         elif self.current_show == self.difference_types[1]:
@@ -204,14 +210,18 @@ class LoadSaveTopoModule(ModuleTemplate):
         Returns:
             absolute_topo, the cropped frame minus the mean value and relative_topo, the absolute topo normalized to the extent of the sandbox
         """
-        cropped_frame = frame[self.box_origin[1]:self.box_origin[1] + self.box_height,
-                        self.box_origin[0]:self.box_origin[0] + self.box_width]
+        cropped_frame = self._crop_box(frame)
 
         mean_height = cropped_frame.mean()
         absolute_topo = cropped_frame - mean_height
         relative_topo = absolute_topo / (self.vmax - self.vmin)
         return absolute_topo, relative_topo
 
+    def _crop_box(self, frame: numpy.ndarray):
+        """View of the box area of the frame"""
+        return frame[self.box_origin[1]:self.box_origin[1] + self.box_height,
+                     self.box_origin[0]:self.box_origin[0] + self.box_width]
+
     def extractTopo(self):
         """
         Extract the topography of the current frame and stores the value internally
@@ -256,17 +266,36 @@ class LoadSaveTopoModule(ModuleTemplate):
             #self.loaded = self.modify_to_box_coordinates(self.absolute_topo[:shape_frame[0],
             #                                             :shape_frame[1]])
             self.loaded = self.absolute_topo[:shape_frame[0], :shape_frame[1]]
-            #if self._lod is None:
-            self._lod = ax.imshow(self.loaded, cmap='gist_earth_r', origin="lower", #TODO: data is inverted, need to fix this for all the landsladides topography data
-                                      zorder=2, extent=self.to_box_extent, aspect="auto")
-            #else:
-             #   self._lod.set_array(self.loaded[:-1,:-1].ravel())
+            #TODO: data is inverted, need to fix this for all the landsladides topography data
+            self._show_image(ax, self.loaded, cmap='gist_earth_r', zorder=2)
         else:
           #  if self._lod is not None:
            #     self._lod.remove()
            #     self._lod = None
             print("No Topography loaded, please load a Topography")
 
+    def _show_image(self, ax, data, norm=None, vmin=None, vmax=None, **kwargs):
+        """
+        Display data in the box area. The image is created on the first frame and afterwards only its data,
+        extent and norm are updated, instead of adding a new image to the axes on every frame
+        Args:
+            ax: axes to plot the data
+            data: 2d array to show
+            norm, vmin, vmax: as in imshow, applied on every frame
+            **kwargs: style of the image (cmap, alpha, zorder), only used when the image is created
+        Returns:
+        """
+        if self._lod is None:
+            self._lod = ax.imshow(data, norm=norm, vmin=vmin, vmax=vmax, origin="lower",
+                                  extent=self.to_box_extent, aspect="auto", **kwargs)
+        else:
+            self._lod.set_data(data)
+            self._lod.set_extent(self.to_box_extent)
+            if norm is not None:
+                self._lod.set_norm(norm)
+            if vmin is not None or vmax is not None:
+                self._lod.set_clim(vmin, vmax)
+
     def modify_to_box_coordinates(self, frame):
         """
         Since the box is not in the origin of the frame,
@@ -312,8 +341,8 @@ class LoadSaveTopoModule(ModuleTemplate):
 
     def getBoxShape(self):
         """This will return the shape of the current saved topography"""
-        current_absolute_topo, current_relative_topo = self.getBoxFrame(self.frame)
-        x_dimension, y_dimension = current_absolute_topo.shape
+        # only the shape of the box is needed, not its topography
+        x_dimension, y_dimension = self._crop_box(self.frame).shape
         x_saved, y_saved = self.absolute_topo.shape
         shape_frame = [numpy.min((x_dimension, x_saved)), numpy.min((y_dimension, y_saved))]
         return shape_frame
@@ -348,18 +377,11 @@ class LoadSaveTopoModule(ModuleTemplate):
         if self.is_loaded:
             difference = self.extractDifference()
             # plot
-           # if self._dif is None:
-            self._lod = ax.imshow(difference,
-                                            cmap=self.cmap_difference,
-                                            alpha=self.transparency_difference,
-                                            norm=self.norm_difference,
-                                       origin = "lower",
-                                       zorder=1,
-                                   extent  =self.to_box_extent,
-                                  aspect="auto"
-                                       )
-            #else:
-             #   self._dif.set_array(difference[:-1, :-1].ravel())
+            self._show_image(ax, difference,
+                             cmap=self.cmap_difference,
+                             alpha=self.transparency_difference,
+                             norm=self.norm_difference,
+                             zorder=1)
         else:
             #if self._dif is not None:
             #    self._dif.remove()
@@ -376,20 +398,13 @@ class LoadSaveTopoModule(ModuleTemplate):
         if self.is_loaded:
             grad = self.extractGradDifference()
             # plot
-            # if self._dif is None:
-            self._lod = ax.imshow(grad,
-                                  vmin=-5,
-                                  vmax=5,
-                                  cmap=self.cmap_difference,
-                                  alpha=self.transparency_difference,
-                                  norm=self.norm_difference,
-                                  origin="lower",
-                                  zorder=1,
-                                  extent=self.to_box_extent,
-                                  aspect="auto"
-                                  )
-            # else:
-            #   self._dif.set_array(difference[:-1, :-1].ravel())
+            self._show_image(ax, grad,
+                             vmin=-5,
+                             vmax=5,
+                             cmap=self.cmap_difference,
+                             alpha=self.transparency_difference,
+                             norm=self.norm_difference,
+                             zorder=1)
         else:
             # if self._dif is not None:
             #    self._dif.remove()
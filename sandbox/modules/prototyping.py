@@ -20,7 +20,7 @@ class PrototypingModule(ModuleTemplate):
             frame = self.clip_frame(frame)
 
         self.plot.render_frame(frame)
-        self.projector.frame.object = self.plot.figure
+        self.projector.figure = self.plot.figure
 
     def update(self):
         frame = self.sensor.get_frame()
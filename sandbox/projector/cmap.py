@@ -41,6 +41,7 @@ class CmapModule:
 
         self.cmap = plt.cm.get_cmap(cmap)#self.set_cmap(plt.cm.get_cmap(cmap), over, under, bad)
         self._cmap = None
+        self._cmap_extremes = None  # over, under and bad colors last set on self.cmap
         self.norm = norm
         self.lot = lot  # TODO: Future feature
         self.col = None
@@ -114,6 +115,11 @@ class CmapModule:
             cmap = self._cmap
             self._cmap = None
 
+        # the image maps the data through the lookup table of the colormap, which is only rebuilt when the colormap
+        # changes. Setting the same colormap and colors again on every frame would invalidate it for nothing
+        if cmap is self.cmap and self.col.cmap is cmap and (over, under, bad) == self._cmap_extremes:
+            return None
+
         if over is not None:
             cmap.set_over(over, 1.0)
         if under is not None:
@@ -121,6 +127,7 @@ class CmapModule:
         if bad is not None:
             cmap.set_bad(bad, 1.0)
         self.cmap = cmap
+        self._cmap_extremes = (over, under, bad)
         self.col.set_cmap(cmap)
         return None
 
@@ -161,8 +168,10 @@ class CmapModule:
         #self.col = matplotlib.image.AxesImage(ax, cmap=self.cmap, norm=self.norm,
                                                 #  origin='lower',zorder=-1)
         #self.set_data(data)
+        # the frame is resampled to the projector resolution on every draw. For the small scaling factors of the
+        # sandbox bilinear looks the same as the default 'antialiased' (hanning) filter and is cheaper
         self.col = ax.imshow(data, vmin=vmin, vmax=vmax,
-                             cmap=self.cmap, norm=self.norm,
+                             cmap=self.cmap, norm=self.norm, interpolation='bilinear',
                              origin='lower', aspect='auto', zorder=-1, extent=extent)
         self._col = weakref.ref(self.col)
 
@@ -55,6 +55,12 @@ class ContourLinesModule:
             self.vmin = self.extent[4]
             self.vmax = self.extent[5]
             self.previous_frame = None
+            self._drawn_settings = None  # settings of the contours currently on the axes
+            # the levels are only recomputed when vmin, vmax or the step change
+            self._levels = None
+            self._levels_key = None
+            self._levels_minor = None
+            self._levels_minor_key = None
 
             # flags
             self.contours = contours
@@ -91,6 +97,12 @@ class ContourLinesModule:
             self.vmin = extent[-2]
             self.vmax = extent[-1]
 
+            # contouring is expensive, keep the drawn contours if neither the frame nor the settings changed
+            settings = self._contour_settings(extent)
+            if same_frame and settings == self._drawn_settings and self._contours_on_axes(ax):
+                return sb_params
+            self._drawn_settings = settings
+
             self.delete_contourns(ax)
 
             if self.contours:
@@ -102,17 +114,35 @@ class ContourLinesModule:
         else:
             if self._active:
                 self.delete_contourns(ax)
+                self._drawn_settings = None
             self._active = active
 
         return sb_params
 
+    def _contour_settings(self, extent):
+        return (tuple(extent), self.contours, self.contours_step, self.contours_width, self.contours_color,
+                self.minor_contours, self.contours_step_minor, self.contours_width_minor,
+                self.contours_label, self.contours_label_inline, self.contours_label_fontsize,
+                self.contours_label_format)
+
+    def _contours_on_axes(self, ax):
+        """Check that the last drawn contours were not removed from the axes in the meantime"""
+        drawn = []
+        # matplotlib >= 3.8 draws a ContourSet as a single collection, older versions as a list of them
+        if self.contours and self.major is not None:
+            drawn += getattr(self.major, 'collections', [self.major])
+        if self.minor_contours and self.minor is not None:
+            drawn += getattr(self.minor, 'collections', [self.minor])
+        return all(coll in ax.collections for coll in drawn)
+
 
     #def set_array(self, data):
     ##    self.major.set_array(data)
      #   self.minor.set_array(data)
 
     def delete_contourns(self, ax):
-        [coll.remove() for coll in reversed(ax.collections) if isinstance(coll, matplotlib.collections.LineCollection)]
+        [coll.remove() for coll in reversed(ax.collections)
+         if isinstance(coll, (matplotlib.collections.LineCollection, matplotlib.contour.ContourSet))]
         [text.remove() for text in reversed(ax.artists) if isinstance(text, matplotlib.text.Text)]
 
     def plot_contour_lines(self, frame, ax):
@@ -151,14 +181,20 @@ class ContourLinesModule:
     @property
     def contours_levels(self):
         """Returns the current contour levels, being aware of changes in calibration."""
-
-        return numpy.arange(self.vmin, self.vmax, self.contours_step)
+        key = (self.vmin, self.vmax, self.contours_step)
+        if key != self._levels_key:
+            self._levels = numpy.arange(self.vmin, self.vmax, self.contours_step)
+            self._levels_key = key
+        return self._levels
 
     @property
     def contours_levels_minor(self):
         """Returns the current contour levels, being aware of changes in calibration."""
-
-        return numpy.arange(self.vmin, self.vmax, self.contours_step_minor)
+        key = (self.vmin, self.vmax, self.contours_step_minor)
+        if key != self._levels_minor_key:
+            self._levels_minor = numpy.arange(self.vmin, self.vmax, self.contours_step_minor)
+            self._levels_minor_key = key
+        return self._levels_minor
 
 
     def show_widgets(self):
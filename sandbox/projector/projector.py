@@ -2,12 +2,15 @@ import panel as pn
 pn.extension()
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from io import BytesIO
 import json
+import threading
 from sandbox import _calibration_dir
 
 
 class Projector(object):
     dpi = 100  # make sure that figures can be displayed pixel-precise
+    jpeg_quality = 90  # the compression artifacts at this quality are not visible on the sand
 
     css = '''
     body {
@@ -61,6 +64,10 @@ class Projector(object):
         self.enable_hot = False
         self.enable_profile = False
 
+        # dragging the frame size sliders fires many events, resize once they stopped moving for resize_delay seconds
+        self.resize_delay = 0.1
+        self._resize_timer = None
+
         # panel components (panes)
         self.panel = None
         self.frame = None
@@ -77,7 +84,10 @@ class Projector(object):
 
         The figure can be accessed by its attribute. It will be 'deactivated' to prevent random apperance in notebooks.
         """
-        pn.extension(raw_css=[self.css])
+        # the css is a global setting that goes into every served page, register it only once and not again for every
+        # new projector or panel
+        if self.css not in pn.config.raw_css:
+            pn.extension(raw_css=[self.css])
         # Create a panel object and serve it within an external bokeh browser that will be opened in a separate window
 
         # In this special case, a "tight" layout would actually add again white space to the plt canvas,
@@ -95,14 +105,12 @@ class Projector(object):
         self.ax.get_yaxis().set_visible(False)
 
 
-        self.frame = pn.pane.Matplotlib(self.figure,
-                                        width=self.p_frame_width,
-                                        height=self.p_frame_height,
-                                        margin=[self.p_frame_top, 0, 0, self.p_frame_left],
-                                        tight=False,
-                                        dpi=self.dpi,
-                                        css_classes=['frame']
-                                        )
+        self.frame = pn.pane.JPG(self._render_frame(),
+                                 width=self.p_frame_width,
+                                 height=self.p_frame_height,
+                                 margin=(self.p_frame_top, 0, 0, self.p_frame_left),
+                                 css_classes=['frame']
+                                 )
         plt.close(self.figure)  # close figure to prevent inline display
 
         if self.enable_legend:
@@ -110,14 +118,14 @@ class Projector(object):
                                     # add parameters from calibration for positioning
                                     width=100,
                                     height=100,
-                                    margin=[0, 0, 0, 0],
+                                    margin=(0, 0, 0, 0),
                                     css_classes=['legend'])
 
         if self.enable_hot:
             self.hot = pn.Column("### Hot area",
                                  width=100,
                                  height=100,
-                                 margin=[0, 0, 0, 0],
+                                 margin=(0, 0, 0, 0),
                                  css_classes=['hot']
                                  )
 
@@ -125,13 +133,13 @@ class Projector(object):
             self.profile = pn.Column("### Profile",
                                      width=100,
                                      height=100,
-                                     margin=[0, 0, 0, 0],
+                                     margin=(0, 0, 0, 0),
                                      css_classes=['profile']
                                      )
 
         # Combine panel and deploy bokeh server
         self.sidebar = pn.Column(self.legend, self.hot, self.profile,
-                                 margin=[self.p_frame_top, 0, 0, 0],
+                                 margin=(self.p_frame_top, 0, 0, 0),
                                  )
 
         self.panel = pn.Row(self.frame, self.sidebar,
@@ -162,7 +170,6 @@ class Projector(object):
         ax.set_axis_off()
         self.figure = figure
         self.ax = ax
-        self.frame.object = figure
         self.trigger()
 
 
@@ -196,12 +203,23 @@ class Projector(object):
         Returns:
 
         """
-        self.figure.canvas.draw_idle()
         #self.figure.canvas.flush_events()
         #self.ax.draw_idle()
-        self.frame.param.trigger('object')
+        self.frame.object = self._render_frame()
         return True
 
+    def _render_frame(self):
+        """
+        Renders the figure in memory for the frame pane. The frame is sent to the browser on every trigger, so send it
+        as a jpeg: much faster to encode and about half the size of a png
+        """
+        b = BytesIO()
+        self.figure.canvas.print_figure(b, format='jpeg', dpi=self.dpi, facecolor=self.figure.get_facecolor(),
+                                        edgecolor=self.figure.get_edgecolor(),
+                                        pil_kwargs={'quality': self.jpeg_quality})
+        b.seek(0)
+        return b
+
     def load_json(self, file: str):
        """
         Load a calibration file (.JSON format) and actualizes the panel parameters 
@@ -311,23 +329,34 @@ class Projector(object):
         m = target.margin
         n = event.new
         # just changing single indices does not trigger updating of pane
-        target.margin = [n, m[1], m[2], m[3]]
+        target.margin = (n, m[1], m[2], m[3])
 
     def _callback_p_frame_left(self, target, event):
         self.p_frame_left = event.new
         m = target.margin
         n = event.new
-        target.margin = [m[0], m[1], m[2], n]
+        target.margin = (m[0], m[1], m[2], n)
 
     def _callback_p_frame_width(self, target, event):
         self.p_frame_width = event.new
-        target.width = event.new
-        target.param.trigger('object')
+        self._request_frame_resize(target)
 
     def _callback_p_frame_height(self, target, event):
         self.p_frame_height = event.new
-        target.height = event.new
-        target.param.trigger('object')
+        self._request_frame_resize(target)
+
+    def _request_frame_resize(self, target):
+        """Debounced resize of the frame pane: restarts the countdown on every call, so a burst of slider events
+        renders the figure only once"""
+        if self._resize_timer is not None:
+            self._resize_timer.cancel()
+        self._resize_timer = threading.Timer(self.resize_delay, self._resize_frame, args=(target,))
+        self._resize_timer.daemon = True
+        self._resize_timer.start()
+
+    def _resize_frame(self, target):
+        # the pane updates the image again when its size changes, set both at once to update it only once
+        target.param.set_param(width=self.p_frame_width, height=self.p_frame_height)
 
     def _callback_json_filename(self, event):
         self.json_filename = event.new
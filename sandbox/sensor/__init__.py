@@ -1,5 +1,12 @@
 from .sensor_api import Sensor, DummySensor, KinectV1, KinectV2
-from .calibration_sensor import CalibSensor
+
+
+def __getattr__(name):
+    # CalibSensor needs panel, matplotlib and the projector, only import them when calibrating
+    if name == 'CalibSensor':
+        from .calibration_sensor import CalibSensor
+        return CalibSensor
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 if __name__ == '__main__':
     pass
@@ -1,4 +1,5 @@
 import threading
+from functools import partial
 import panel as pn
 pn.extension()
 from sandbox.sensor import Sensor
@@ -36,11 +37,26 @@ class CalibSensor: #TODO: include automatic
         self.calib_notebook_frame = pn.pane.Matplotlib(self.figure, tight=False, height=300)
         plt.close()  # close figure to prevent inline display
 
-        self.projector.panel.add_periodic_callback(self.update_panel_frame, 5)
+        # live sensor frame in the projector until the calibration is closed
+        self._panel_frame_callback = self.projector.panel.add_periodic_callback(self.update_panel_frame, 5)
 
         self.frame_raw = self.sensor.get_raw_frame()
-        self.ax_notebook_frame.imshow(self.frame_raw, vmin=self.sensor.s_min, vmax=self.sensor.s_max, cmap=self.cmap,
-                                      origin="lower", aspect="auto")
+        self._drawn_frame = None  # raw frame currently on the notebook frame
+        self._drawn_margins = None  # margins of the patches currently on the notebook frame
+        self._margin_patches = None  # top, right, bottom and left margin patches
+        # dragging a slider fires many events, redraw once it stopped moving for update_delay seconds
+        self.update_delay = 0.1
+        self._update_timer = None
+        self.refresh_delay = 3  # seconds between clicking the refresh button and taking the new frame
+        self._refresh_timer = None
+        # keep the image artist to update it in place instead of clearing the axes on every change
+        self._notebook_image = self.ax_notebook_frame.imshow(self.frame_raw,
+                                                             vmin=self.sensor.s_min,
+                                                             vmax=self.sensor.s_max,
+                                                             cmap=self.cmap,
+                                                             origin="lower",
+                                                             aspect="auto")
+        self._drawn_frame = self.frame_raw
         self.calib_notebook_frame.param.trigger('object')
         self._create_widgets()
 
@@ -73,24 +89,57 @@ class CalibSensor: #TODO: include automatic
         This is only useful when an uncropped dataframe is passed.
         """
 
-        self.ax_notebook_frame.cla()
-        self.ax_notebook_frame.imshow(self.frame_raw, vmin=self.sensor.s_min, vmax=self.sensor.s_max, cmap=self.cmap,
-                                      origin="lower", aspect="auto")
-
-        rec_t = plt.Rectangle((0, self.sensor.s_height - self.sensor.s_top), self.sensor.s_width, self.sensor.s_top,
-                              fc=self.c_margin, alpha=self.margin_alpha)
-        rec_r = plt.Rectangle((self.sensor.s_width - self.sensor.s_right, 0), self.sensor.s_right, self.sensor.s_height,
-                              fc=self.c_margin, alpha=self.margin_alpha)
-        rec_b = plt.Rectangle((0, 0), self.sensor.s_width, self.sensor.s_bottom,
-                              fc=self.c_margin, alpha=self.margin_alpha)
-        rec_l = plt.Rectangle((0, 0), self.sensor.s_left, self.sensor.s_height,
-                              fc=self.c_margin, alpha=self.margin_alpha)
-        self.ax_notebook_frame.add_patch(rec_t)
-        self.ax_notebook_frame.add_patch(rec_r)
-        self.ax_notebook_frame.add_patch(rec_b)
-        self.ax_notebook_frame.add_patch(rec_l)
+        # every widget changes only one part of the plot, update just that part: a new frame comes only from the
+        # refresh button, the vertical sliders only change the colors and the margin sliders only move the patches
+        if self.frame_raw is not self._drawn_frame:
+            self._drawn_frame = self.frame_raw
+            self._notebook_image.set_data(self.frame_raw)
+        clim = (self.sensor.s_min, self.sensor.s_max)
+        if clim != self._notebook_image.get_clim():
+            self._notebook_image.set_clim(vmin=self.sensor.s_min, vmax=self.sensor.s_max)
+
+        margins = (self.sensor.s_top, self.sensor.s_right, self.sensor.s_bottom, self.sensor.s_left,
+                   self.sensor.s_width, self.sensor.s_height)
+        if margins != self._drawn_margins:
+            self._drawn_margins = margins
+            self._draw_margin_patches()
         self.calib_notebook_frame.param.trigger('object')
 
+    def close(self):
+        """Stop reading the sensor for the live frame in the projector and any pending notebook update"""
+        if self._panel_frame_callback is not None:
+            self._panel_frame_callback.stop()
+            self._panel_frame_callback = None
+        if self._update_timer is not None:
+            self._update_timer.cancel()
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        print('Sensor calibration closed.')
+
+    def _request_notebook_update(self):
+        """Debounced update_notebook_frame: restarts the countdown on every call, so a burst of slider events
+        is rendered only once"""
+        if self._update_timer is not None:
+            self._update_timer.cancel()
+        self._update_timer = threading.Timer(self.update_delay, self.update_notebook_frame)
+        self._update_timer.daemon = True
+        self._update_timer.start()
+
+    def _draw_margin_patches(self):
+        """Place the top, right, bottom and left margin patches. They are created once and afterwards only moved"""
+        bounds = [(0, self.sensor.s_height - self.sensor.s_top, self.sensor.s_width, self.sensor.s_top),
+                  (self.sensor.s_width - self.sensor.s_right, 0, self.sensor.s_right, self.sensor.s_height),
+                  (0, 0, self.sensor.s_width, self.sensor.s_bottom),
+                  (0, 0, self.sensor.s_left, self.sensor.s_height)]
+        if self._margin_patches is None or \
+                any(patch not in self.ax_notebook_frame.patches for patch in self._margin_patches):
+            [patch.remove() for patch in reversed(self.ax_notebook_frame.patches)]
+            self._margin_patches = [plt.Rectangle((x, y), width, height, fc=self.c_margin, alpha=self.margin_alpha)
+                                    for x, y, width, height in bounds]
+            [self.ax_notebook_frame.add_patch(patch) for patch in self._margin_patches]
+        else:
+            [patch.set_bounds(*bound) for patch, bound in zip(self._margin_patches, bounds)]
+
     def calibrate_sensor(self):
         widgets = pn.WidgetBox('<b>Load a projector calibration file</b>',
                                self._widget_json_filename_load_projector,
@@ -106,7 +155,8 @@ class CalibSensor: #TODO: include automatic
                                '<b>Distance from sensor (mm)</b>',
                                self._widget_s_min,
                                self._widget_s_max,
-                               self._widget_refresh_frame)
+                               self._widget_refresh_frame,
+                               self._widget_close_calibration)
         box = pn.Column('<b>Physical dimensions of the sandbox</b>',
                         self._widget_box_width,
                         self._widget_box_height,
@@ -132,42 +182,42 @@ class CalibSensor: #TODO: include automatic
                                                   value=self.sensor.s_top,
                                                   start=1,
                                                   end=self.sensor.s_height)
-        self._widget_s_top.param.watch(self._callback_s_top, 'value', onlychanged=False)
+        self._widget_s_top.param.watch(partial(self._callback_sensor_value, 's_top'), 'value')
 
         self._widget_s_right = pn.widgets.IntSlider(name='Sensor right margin',
                                                     bar_color=self.c_margin,
                                                     value=self.sensor.s_right,
                                                     start=1,
                                                     end=self.sensor.s_width)
-        self._widget_s_right.param.watch(self._callback_s_right, 'value', onlychanged=False)
+        self._widget_s_right.param.watch(partial(self._callback_sensor_value, 's_right'), 'value')
 
         self._widget_s_bottom = pn.widgets.IntSlider(name='Sensor bottom margin',
                                                      bar_color=self.c_margin,
                                                      value=self.sensor.s_bottom,
                                                      start=1,
                                                      end=self.sensor.s_height)
-        self._widget_s_bottom.param.watch(self._callback_s_bottom, 'value', onlychanged=False)
+        self._widget_s_bottom.param.watch(partial(self._callback_sensor_value, 's_bottom'), 'value')
 
         self._widget_s_left = pn.widgets.IntSlider(name='Sensor left margin',
                                                    bar_color=self.c_margin,
                                                    value=self.sensor.s_left,
                                                    start=1,
                                                    end=self.sensor.s_width)
-        self._widget_s_left.param.watch(self._callback_s_left, 'value', onlychanged=False)
+        self._widget_s_left.param.watch(partial(self._callback_sensor_value, 's_left'), 'value')
 
         self._widget_s_min = pn.widgets.IntSlider(name='Vertical minimum',
                                                   bar_color=self.c_under,
                                                   value=self.sensor.s_min,
                                                   start=0,
                                                   end=2000)
-        self._widget_s_min.param.watch(self._callback_s_min, 'value', onlychanged=False)
+        self._widget_s_min.param.watch(partial(self._callback_sensor_value, 's_min'), 'value')
 
         self._widget_s_max = pn.widgets.IntSlider(name='Vertical maximum',
                                                   bar_color=self.c_over,
                                                   value=self.sensor.s_max,
                                                   start=0,
                                                   end=2000)
-        self._widget_s_max.param.watch(self._callback_s_max, 'value', onlychanged=False)
+        self._widget_s_max.param.watch(partial(self._callback_sensor_value, 's_max'), 'value')
 
         # Auto cropping widgets:
 
@@ -203,6 +253,11 @@ class CalibSensor: #TODO: include automatic
         self._widget_refresh_frame = pn.widgets.Button(name='Refresh sensor frame\n(3 sec. delay)!')
         self._widget_refresh_frame.param.watch(self._callback_refresh_frame, 'clicks', onlychanged=False)
 
+        # close button
+
+        self._widget_close_calibration = pn.widgets.Button(name='Close calibration')
+        self._widget_close_calibration.param.watch(self._callback_close_calibration, 'clicks', onlychanged=False)
+
         # save selection
 
         # Only for reading files --> Is there no location picker in panel widgets???
@@ -224,41 +279,29 @@ class CalibSensor: #TODO: include automatic
         return True
 
         # sensor callbacks
-    def _callback_s_top(self, event):
-        self.sensor.s_top = event.new
+    def _callback_sensor_value(self, attribute, event):
+        """Shared callback of the margin and vertical range sliders, bound to the sensor attribute of each slider.
+        The sliders are watched for changes only, a value set again does not redraw"""
+        setattr(self.sensor, attribute, event.new)
         # change plot and trigger panel update
-        self.update_notebook_frame()
-
-    def _callback_s_right(self, event):
-        self.sensor.s_right = event.new
-        #self._refresh_panel_frame() #TODO: dirty workaround
-        self.update_notebook_frame()
-
-    def _callback_s_bottom(self, event):
-        self.sensor.s_bottom = event.new
-        self.update_notebook_frame()
-
-    def _callback_s_left(self, event):
-        self.sensor.s_left = event.new
-        #self._refresh_panel_frame()  # TODO: dirty workaround
-        self.update_notebook_frame()
-
-    def _callback_s_min(self, event):
-        self.sensor.s_min = event.new
-        #self._refresh_panel_frame()  # TODO: dirty workaround
-        self.update_notebook_frame()
-
-    def _callback_s_max(self, event):
-        self.sensor.s_max = event.new
-        #self._refresh_panel_frame()  # TODO: dirty workaround
-        self.update_notebook_frame()
+        self._request_notebook_update()
 
     def _callback_refresh_frame(self, event):
-        plt.pause(3)
+        # wait before taking the frame without blocking the server, e.g. to get the hands out of the sandbox
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_timer = threading.Timer(self.refresh_delay, self._refresh_frame)
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _refresh_frame(self):
         # only here, get a new frame before updating the plot
         self.frame_raw = self.sensor.get_raw_frame()
         self.update_notebook_frame()
 
+    def _callback_close_calibration(self, event):
+        self.close()
+
     def _callback_json_filename(self, event):
         self.sensor.json_filename = event.new
 
@@ -1,6 +1,10 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy
-from scipy.spatial.distance import cdist  # for DummySensor
-from scipy.interpolate import griddata  # for DummySensor
+from scipy.spatial import Delaunay  # for DummySensor
+from scipy.interpolate import CloughTocher2DInterpolator  # for DummySensor
+
+_MAX_WORKERS = 4
 
 
 class DummySensor:
@@ -21,6 +25,8 @@ class DummySensor:
             alteration_strength:
             **kwargs:
                - random_seed
+               - n_workers: number of threads the interpolation of a frame is split in. Predefined is the number
+                 of cpus, at most 4. Call close to end the threads
 
         """
 
@@ -41,9 +47,19 @@ class DummySensor:
         self.strength = alteration_strength
 
         self.grid = None
+        self._grid_points = None
+        self._grid_chunks = None
         self.positions = None
         self.os_values = None
         self.values = None
+        self._triangulation = None
+
+        # the frames depend on the previous ones, so instead of taking several frames at once split the
+        # interpolation of every frame over the grid. scipy evaluates it without holding the GIL
+        self.n_workers = kwargs.get('n_workers', min(_MAX_WORKERS, os.cpu_count() or 1))
+        self._executor = None
+        if self.n_workers > 1:
+            self._executor = ThreadPoolExecutor(self.n_workers, thread_name_prefix='DummySensor')
 
         # create grid, init values, and init interpolation
         self._create_grid()
@@ -62,14 +78,27 @@ class DummySensor:
         self._interpolate()
         return self.depth
 
+    def close(self):
+        """End the interpolation threads"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self.n_workers = 1
+
     def _oscillating_depth(self, random):
         r = (self.depth_lim[1] - self.depth_lim[0]) / 2
         return numpy.sin(random) * r + r + self.depth_lim[0]
 
     def _create_grid(self):
-        # creates 2D grid for given resolution
-        x, y = numpy.meshgrid(numpy.arange(0, self.depth_width, 1), numpy.arange(0, self.depth_height, 1))
-        self.grid = numpy.stack((x.ravel(), y.ravel())).T
+        # creates 2D grid for given resolution as (width * height, 2) int32 array of (x, y) pixel coordinates
+        y, x = numpy.indices((self.depth_height, self.depth_width), dtype=numpy.int32)
+        grid = numpy.empty((self.depth_height * self.depth_width, 2), dtype=numpy.int32)
+        grid[:, 0] = x.ravel()
+        grid[:, 1] = y.ravel()
+        self.grid = grid
+        # float64 copy of the grid, the dtype the interpolator works with, so it is not converted every frame
+        self._grid_points = grid.astype(numpy.float64)
+        self._grid_chunks = numpy.array_split(self._grid_points, max(self.n_workers, 1))
         return True
 
     def _pick_positions(self):
@@ -101,24 +130,32 @@ class DummySensor:
             points[0, :2] = self.grid[ipos, :2]
             i = 1  # counter
 
+        # keep the squared distance of every grid point to its closest picked point,
+        # so each iteration only has to account for the newly picked point
+        grid = self._grid_points
+        min_dist = numpy.full(gl, numpy.inf)
+        for point in points[:i, :2]:
+            numpy.minimum(min_dist, ((grid - point) ** 2).sum(axis=1), out=min_dist)
+        distance = self.distance ** 2
+
         while i < n:
-            # calculate all distances between remaining candidates and sim points
-            dist = cdist(points[:i, :2], self.grid[:, :2])
             # choose candidates which are out of range
-            mm = numpy.min(dist, axis=0)
-            candidates = self.grid[mm > self.distance]
+            candidates = numpy.flatnonzero(min_dist > distance)
             # count candidates
             cl = candidates.shape[0]
             if cl < 1:
                 break
             # randomly pick candidate and set next point
             pos = numpy.random.randint(0, cl)
-            points[i, :2] = candidates[pos, :2]
+            points[i, :2] = self.grid[candidates[pos], :2]
+            numpy.minimum(min_dist, ((grid - points[i, :2]) ** 2).sum(axis=1), out=min_dist)
 
             i += 1
 
         # just return valid points if early break occured
         self.positions = points[:i]
+        # positions do not move between frames, so triangulate them only once
+        self._triangulation = Delaunay(self.positions[:, :2])
 
         return True
 
@@ -131,10 +168,14 @@ class DummySensor:
         # maximum range in both directions the values should be altered
 
         os_range = self.strength * (numpy.pi / 2)
-        for i, value in enumerate(self.os_values):
-            self.os_values[i] = value + numpy.random.uniform(-os_range, os_range)
+        self.os_values += numpy.random.uniform(-os_range, os_range, self.os_values.shape[0])
         self.values = self._oscillating_depth(self.os_values)
 
     def _interpolate(self):
-        inter = griddata(self.positions[:, :2], self.values, self.grid[:, :2], method='cubic', fill_value=0)
+        # same as griddata(..., method='cubic') but reusing the triangulation of the positions
+        interpolator = CloughTocher2DInterpolator(self._triangulation, self.values, fill_value=0)
+        if self.n_workers > 1:
+            inter = numpy.concatenate(list(self._executor.map(interpolator, self._grid_chunks)))
+        else:
+            inter = interpolator(self._grid_points)
         self.depth = inter.reshape(self.depth_height, self.depth_width)
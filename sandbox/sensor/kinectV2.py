@@ -60,6 +60,9 @@ class KinectV2:
         self.color_height = 1080
         self.depth = None
         self.color = None
+        # lookup table of get_ir_frame for uint16 frames and the (min, max) it was built for
+        self._ir_lut = None
+        self._ir_lut_range = None
         self._init_device()
 
         #self.depth = self.get_frame()
@@ -171,21 +174,24 @@ class KinectV2:
             return ir
         elif typ == 'color':
             color = frames[FrameType.Color].to_array()
-            resolution_camera = self.color_height * self.color_width  # resolution camera Kinect V2
-            palette = numpy.reshape(color, (resolution_camera, 4))[:, [2, 1, 0]]
-            position_palette = numpy.reshape(numpy.arange(0, len(palette), 1), (self.color_height, self.color_width))
-            color = palette[position_palette]
+            color = self._bgra_to_rgb(color)
             return color
         else:
             color = frames[FrameType.Color].to_array()
-            resolution_camera = self.color_height * self.color_width  # resolution camera Kinect V2
-            palette = numpy.reshape(color, (resolution_camera, 4))[:, [2, 1, 0]]
-            position_palette = numpy.reshape(numpy.arange(0, len(palette), 1), (self.color_height, self.color_width))
-            color = palette[position_palette]
+            color = self._bgra_to_rgb(color)
             depth = frames[FrameType.Depth].to_array()
             ir = frames[FrameType.Ir].to_array()
             return color, depth, ir
 
+    def _bgra_to_rgb(self, color):
+        """
+        Args:
+            color: BGRA color frame of the camera, flattened or not
+        Returns:
+               3D Array of the shape(1080, 1920, 3) with the RGB channels, dropping the 4th (intensity) column
+        """
+        return numpy.reshape(color, (self.color_height, self.color_width, 4))[:, :, [2, 1, 0]]
+
     def get_frame(self):
         """
         Args:
@@ -226,7 +232,14 @@ class KinectV2:
 
         """
         ir_frame_raw = self.get_ir_frame_raw()
-        self.ir_frame = numpy.interp(ir_frame_raw, (min, max), (0, 255)).astype('uint8')
+        if ir_frame_raw.dtype == numpy.uint16:
+            # map every possible uint16 value once and then just index the table, avoids the float64 temporary
+            if self._ir_lut_range != (min, max):
+                self._ir_lut = numpy.interp(numpy.arange(65536), (min, max), (0, 255)).astype('uint8')
+                self._ir_lut_range = (min, max)
+            self.ir_frame = self._ir_lut[ir_frame_raw]
+        else:  # e.g. float32 frames of libfreenect2
+            self.ir_frame = numpy.interp(ir_frame_raw, (min, max), (0, 255)).astype('uint8')
         return self.ir_frame
 
     def get_color(self):
@@ -237,11 +250,8 @@ class KinectV2:
         """
         if _platform == 'Windows':
             color_flattened = self.device.get_last_color_frame()
-            resolution_camera = self.color_height * self.color_width  # resolution camera Kinect V2
-            # Palette of colors in RGB / Cut of 4th column marked as intensity
-            palette = numpy.reshape(numpy.array([color_flattened]), (resolution_camera, 4))[:, [2, 1, 0]]
-            position_palette = numpy.reshape(numpy.arange(0, len(palette), 1), (self.color_height, self.color_width))
-            self.color = numpy.flipud(palette[position_palette])
+            # view of the flat BGRA buffer, only the channel selection in _bgra_to_rgb copies the frame
+            self.color = numpy.flipud(self._bgra_to_rgb(numpy.frombuffer(color_flattened, dtype=numpy.uint8)))
         elif _platform =='Linux':
             self.color = self.get_linux_frame(typ='color')
         return self.color
@@ -4,6 +4,7 @@ import scipy
 import scipy.ndimage
 from warnings import warn
 import json
+import threading
 
 from .kinectV1 import KinectV1
 from .kinectV2 import KinectV2, _platform
@@ -26,7 +27,8 @@ class Sensor:
     """
     def __init__(self, calibsensor: str = None, name: str ='kinect_v2', crop_values: bool = True,
                  clip_values: bool = False, gauss_filter: bool = True,
-                 n_frames: int = 3, gauss_sigma: int = 3, invert: bool = True, **kwargs):
+                 n_frames: int = 3, gauss_sigma: int = 3, gauss_truncate: float = 2.5, invert: bool = True,
+                 **kwargs):
         """
         Sensor Api class to manage the different sensor for the frame adquisition
         Args:
@@ -37,6 +39,7 @@ class Sensor:
             gauss_filter: apply a gaussian filter to the data
             n_frames: number of frames to get the average. Avoids anomalies
             gauss_sigma: How strong the filter is
+            gauss_truncate: Truncate the filter kernel at this many standard deviations. Smaller is faster
             inverted: The data is measured from the sensor outwards. \
                         This will normalize the data according to the maximun value of the sensor
             **kwargs:
@@ -81,15 +84,29 @@ class Sensor:
         self.filter = gauss_filter
         self.n_frames = n_frames
         self.sigma_gauss = gauss_sigma
+        self.truncate_gauss = gauss_truncate
         self.invert = invert
 
         self.s_name = self.Sensor.name
         self.s_width = self.Sensor.depth_width
         self.s_width = self.Sensor.depth_width
         self.s_height = self.Sensor.depth_height
+        # accumulators reused by get_raw_frame to average the last n frames. Raw frames keep the dtype of the
+        # sensor (uint16 for the kinects) and are only cast to float32 here, which is precise enough for depth in mm
+        self._depth_sum = numpy.zeros((self.s_height, self.s_width), dtype=numpy.float32)
+        self._depth_count = numpy.zeros((self.s_height, self.s_width), dtype=numpy.int16)
         self.depth = None
         self.crop = crop_values
         self.clip = clip_values
+
+        # capture thread, see run_capture
+        self._sensor_lock = threading.Lock()  # the frame accumulators are shared with the capture thread
+        self._frame_ready = threading.Event()
+        self._capture_stop_event = threading.Event()
+        self._captured_frame = None
+        self._capture_error = None  # exception that ended the capture thread, raised again by get_frame
+        self.capture_thread = None
+        self.capture_status = 'stopped'  # status: 'stopped', 'running'
         self.get_frame()
 
     def get_raw_frame(self, gauss_filter: bool = True) -> numpy.ndarray:
@@ -97,16 +114,20 @@ class Sensor:
 
         With the Dummy sensor it will sample noise
         """
-        # collect last n frames in a stack
-        depth_array = self.Sensor.get_frame()
-        for i in range(self.n_frames - 1):
-            depth_array = numpy.dstack([depth_array, self.Sensor.get_frame()])
-        # calculate mean values ignoring zeros by masking them
-        depth_array_masked = numpy.ma.masked_where(depth_array == 0, depth_array)  # needed for V2?
-        depth = numpy.ma.mean(depth_array_masked, axis=2)
+        # accumulate the last n frames, ignoring zeros (no data) in the mean
+        with self._sensor_lock:
+            self._depth_sum.fill(0)
+            self._depth_count.fill(0)
+            for i in range(self.n_frames):
+                frame = self.Sensor.get_frame()
+                valid = frame != 0  # needed for V2?
+                numpy.add(self._depth_sum, frame, out=self._depth_sum, where=valid)
+                self._depth_count += valid
+            # pixels without any valid value stay 0
+            depth = numpy.divide(self._depth_sum, numpy.maximum(self._depth_count, 1), dtype=numpy.float32)
         if gauss_filter:
-            # apply gaussian filter
-            depth = scipy.ndimage.filters.gaussian_filter(depth, self.sigma_gauss)
+            # apply gaussian filter in place
+            scipy.ndimage.gaussian_filter(depth, self.sigma_gauss, output=depth, truncate=self.truncate_gauss)
 
         return depth
 
@@ -183,24 +204,8 @@ class Sensor:
     def crop_frame(self, frame: numpy.ndarray) -> numpy.ndarray:
         """ Crops the data frame according to the horizontal margins set up in the calibration
         """
-
-        # TODO: Does not work yet for s_top = 0 and s_right = 0, which currently returns an empty frame!
-        # TODO: Workaround: do not allow zeroes in calibration widget and use default value = 1
-        # TODO: File numpy issue?
-        crop = frame[self.s_bottom:-self.s_top, self.s_left:-self.s_right]
-        return crop
-
-    def crop_frame_workaround(self, frame: numpy.ndarray) -> numpy.ndarray:
-        # bullet proof working example
-        if self.s_top == 0 and self.s_right == 0:
-            crop = frame[self.s_bottom:, self.s_left:]
-        elif self.s_top == 0:
-            crop = frame[self.s_bottom:, self.s_left:-self.s_right]
-        elif self.s_right == 0:
-            crop = frame[self.s_bottom:-self.s_top, self.s_left:]
-        else:
-            crop = frame[self.s_bottom:-self.s_top, self.s_left:-self.s_right]
-
+        # a margin of 0 must leave the end of the slice open, frame[10:-0] would be empty
+        crop = frame[self.s_bottom:-self.s_top or None, self.s_left:-self.s_right or None]
         return crop
 
     def depth_mask(self, frame: numpy.ndarray) -> numpy.ndarray:
@@ -208,7 +213,8 @@ class Sensor:
         above and below. If you also want to use clipping, make sure to use the mask before.
         """
         #TODO: depth mask is masking everything. returning empty
-        mask = numpy.ma.getmask(numpy.ma.masked_outside(frame, self.s_min, self.s_max))
+        # same as numpy.ma.getmask(numpy.ma.masked_outside(frame, self.s_min, self.s_max)) without the masked array
+        mask = (frame < self.s_min) | (frame > self.s_max)
         return mask
 
     def clip_frame(self, frame: numpy.ndarray) -> numpy.ndarray:
@@ -219,18 +225,86 @@ class Sensor:
         clip = numpy.clip(frame, self.s_min, self.s_max)
         return clip
 
-    def get_frame(self) -> numpy.ndarray:
+    def _process_frame(self) -> numpy.ndarray:
+        # the raw frame is a new array owned by this call, so crop it as a view and clip and invert it in place,
+        # same as crop_frame, clip_frame and get_inverted_frame without a new array for every step
         frame = self.get_raw_frame(self.filter)
         if self.crop:
             frame = self.crop_frame(frame)
         if self.clip:
             #frame = self.depth_mask(frame) #TODO: When is this needed?
-            frame = self.clip_frame(frame)
+            numpy.clip(frame, self.s_min, self.s_max, out=frame)
         if self.invert:
-            frame = self.get_inverted_frame(frame)
-        self.depth = frame
+            numpy.subtract(self.s_max, frame, out=frame)
+        return frame
+
+    def get_frame(self) -> numpy.ndarray:
+        """Grab, filter, crop, clip and invert a new frame.
+        While the capture thread is running, return the latest frame it produced instead of reading the sensor
+        """
+        if self.capture_status == 'running':
+            self._frame_ready.wait()  # only blocks until the first frame of the thread is ready
+        if self._capture_error is not None:
+            # the capture thread died, pass its error on once. The next calls read the sensor themselves
+            error, self._capture_error = self._capture_error, None
+            raise error
+        if self.capture_status == 'running':
+            self.depth = self._captured_frame
+        else:
+            self.depth = self._process_frame()
         return self.depth
 
+    def _capture_loop(self):
+        try:
+            while not self._capture_stop_event.is_set():
+                # every frame is a new array, so swapping the reference never modifies a frame already handed out
+                self._captured_frame = self._process_frame()
+                self._frame_ready.set()
+        except Exception as e:
+            logging.error('Capture thread stopped', exc_info=True)
+            self._capture_error = e
+            self._capture_stop_event.set()
+            self.capture_status = 'stopped'
+            self._frame_ready.set()  # wake up the callers of get_frame waiting for a frame
+
+    def run_capture(self):
+        """Read and process the sensor frames in a background thread, so get_frame does not wait for the sensor
+        and the consumers (e.g. the MainThread modules) can work on the previous frame in the meantime"""
+        with self._sensor_lock:  # two quick calls must not start two threads
+            if self.capture_status == 'running':
+                print('Capture thread already running.')
+                return
+            if self.capture_thread is not None:
+                self.capture_thread.join()  # a thread that ended with an error is already leaving its loop
+            self._frame_ready.clear()
+            self._capture_error = None
+            self._capture_stop_event.clear()
+            self.capture_status = 'running'
+            self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self.capture_thread.start()
+        print('Capture thread started.')
+
+    def stop_capture(self):
+        with self._sensor_lock:
+            running = self.capture_status != 'stopped'
+            self.capture_status = 'stopped'
+            self._capture_stop_event.set()  # end thread loop
+        if self.capture_thread is not None:
+            # join outside of the lock, the thread needs it to finish the frame it is reading
+            self.capture_thread.join()
+        self._frame_ready.set()  # wake up the callers of get_frame if the thread ended before its first frame
+        if running:
+            print('Capture thread stopped.')
+        else:
+            print('Capture thread was not running.')
+
+    def close(self):
+        """Stop the capture thread and end the threads of the sensor"""
+        if self.capture_status != 'stopped':
+            self.stop_capture()
+        if isinstance(self.Sensor, DummySensor):
+            self.Sensor.close()
+
     @property
     def vmax(self):
         """return the maximum extent of the sensor according to the calibration file """
@@ -0,0 +1,18 @@
+from sandbox.markers import ArucoMarkers
+import numpy as np
+import pandas as pd
+
+
+def test_convert_color_to_depth_index():
+    """The nearest point of a coordinate map is found by its label, also when the index is not 0...n"""
+    rng = np.random.default_rng(1234)
+    n = 50
+    map = pd.DataFrame({'Depth_x': rng.integers(0, 512, n), 'Depth_y': rng.integers(0, 424, n),
+                        'Color_x': rng.permutation(1920)[:n], 'Color_y': rng.permutation(1080)[:n]},
+                       index=rng.permutation(1000)[:n])
+    aruco = ArucoMarkers()
+    data = pd.DataFrame({'ids': [3, 8], 'x': map.Color_x.iloc[[7, 21]] + 0.2, 'y': map.Color_y.iloc[[7, 21]] - 0.2})
+    value = aruco.convert_color_to_depth(None, map, data=data.reset_index(drop=True))
+    assert list(value.index) == list(map.index[[7, 21]])
+    assert list(value.ids) == [3, 8]
+    assert np.array_equal(value[['Depth_x', 'Depth_y']].values, map[['Depth_x', 'Depth_y']].iloc[[7, 21]].values)
@@ -0,0 +1,62 @@
+from sandbox.modules.block_module import block_module
+from fractions import Fraction
+import numpy as np
+import pytest
+
+# (block shape, rescaled shape): up and down scaling, integer factors with cell centers right on a border, and the
+# kinect v2 frame cropped by the calibration margins
+shapes = [((40, 50), (97, 83)),
+          ((40, 50), (17, 23)),
+          ((60, 80), (30, 20)),
+          ((6, 6), (43, 57)),
+          ((424, 512), (404, 492)),
+          ((1000, 1200), (404, 492))]
+
+
+def _nearest_cells(n_in, n_out):
+    """Input cell that contains the center of each output cell, one cell at a time"""
+    return [min(int(Fraction(2 * i + 1, 2 * n_out) * n_in), n_in - 1) for i in range(n_out)]
+
+
+def _resize_cells(block, shape):
+    rows = _nearest_cells(block.shape[0], shape[0])
+    cols = _nearest_cells(block.shape[1], shape[1])
+    resized = np.empty(tuple(shape) + block.shape[2:], dtype=block.dtype)
+    for i, row in enumerate(rows):
+        for j, col in enumerate(cols):
+            resized[i, j] = block[row, col]
+    return resized
+
+
+@pytest.mark.parametrize('shape_in, shape_out', shapes)
+def test_resize_nearest_2d(shape_in, shape_out):
+    block = np.random.default_rng(1234).random(shape_in).astype(np.float32)
+    resized = block_module._resize_nearest(block, shape_out)
+    assert resized.shape == shape_out
+    assert resized.dtype == np.float32
+    assert np.array_equal(resized, _resize_cells(block, shape_out))
+
+
+@pytest.mark.parametrize('depth', [1, 3, 100])
+@pytest.mark.parametrize('shape_in, shape_out', shapes)
+def test_resize_nearest_3d(shape_in, shape_out, depth):
+    block = np.random.default_rng(1234).random(shape_in + (depth,)).astype(np.float32)
+    resized = block_module._resize_nearest(block, shape_out)
+    assert resized.shape == shape_out + (depth,)
+    # every layer is resized the same as a 2d block
+    assert np.array_equal(resized, _resize_cells(block, shape_out))
+    assert np.array_equal(resized[..., 0], block_module._resize_nearest(block[..., 0], shape_out))
+
+
+def test_height_to_index_out_of_range():
+    depth = 10
+    zmin, zmax = 800.0, 1200.0
+    frame = np.array([[700.0, 800.0, 1000.0], [1200.0, 1300.0, 1e6]])
+    buffer = np.empty(frame.shape)
+    index = np.empty(frame.shape, dtype=np.int32)
+    block_module._height_to_index(frame, zmin, (depth - 1.0) / (zmax - zmin), depth, buffer, index)
+    assert np.array_equal(index, [[0, 0, 4], [9, 9, 9]])
+    # the clipped index can query the blocks without an IndexError or wrapping around
+    block = np.arange(2 * 3 * depth).reshape(2, 3, depth)
+    result = np.take_along_axis(block, index[..., None], axis=2)[..., 0]
+    assert np.array_equal(result, block[[[0], [1]], [0, 1, 2], index])
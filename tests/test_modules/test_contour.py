@@ -58,6 +58,24 @@ def test_update():
     sb_params = module.update(pytest.sb_params)
     fig.show()
 
+def test_update_same_frame():
+    module = ContourLinesModule(extent=extent)
+    fig, ax = plt.subplots()
+    sb_params = dict(pytest.sb_params, ax=ax, same_frame=True)
+
+    module.update(sb_params)
+    drawn = list(ax.collections)
+    assert len(drawn) > 0
+    # the second update with the same frame keeps the contours already on the axes
+    module.update(sb_params)
+    assert list(ax.collections) == drawn
+
+    # once they are removed from the axes they are drawn again
+    module.delete_contourns(ax)
+    assert len(ax.collections) == 0
+    module.update(sb_params)
+    assert len(ax.collections) == len(drawn)
+
 def test_create_widgets_plot():
     module = ContourLinesModule(extent=extent)
     widget = module.show_widgets()
@@ -0,0 +1,94 @@
+from sandbox import _test_data as test_data
+from sandbox.modules import RMS_Grid
+import io
+import numpy as np
+import pytest
+
+# small VIP grid (5 x 3 x 2 cells) and the values the original line by line parser read from it
+vip_file = test_data['test'] + 'test_grid.vip'
+expected = np.load(test_data['test'] + 'test_grid_vip.npz')
+
+
+@pytest.fixture(scope='module')
+def grid():
+    grid = RMS_Grid()
+    with pytest.warns(UserWarning):  # PERM has a value that is not a number
+        grid.load_model_vip(vip_file)
+    return grid
+
+
+def test_load_model_vip(grid):
+    assert (grid.nx, grid.ny, grid.nz) == (5, 3, 2)
+    for key in ('coords_x', 'coords_y', 'coords_z'):
+        coords = getattr(grid, key)
+        assert coords.shape == (5, 3, 2)
+        # the second layer has a corner line with 7 values, so it is parsed line by line
+        assert np.array_equal(coords, expected[key])
+    assert sorted(grid.block_dict.keys()) == ['PERM', 'PORO', 'mask']
+
+
+def test_parse_livecells_vip(grid):
+    mask = grid.block_dict['mask']
+    assert mask.dtype == np.uint8
+    assert mask.shape == (5, 3, 2)
+    assert np.array_equal(mask, expected['block_mask'])
+
+
+def test_parse_block_vip_header_lines(grid):
+    """PORO has lines that are not full and a header line inside a layer"""
+    poro = grid.block_dict['PORO']
+    assert poro.dtype == np.float32
+    assert poro.shape == (5, 3, 2)
+    assert np.array_equal(poro, expected['block_PORO'].astype(np.float32))
+
+
+def test_parse_block_vip_invalid_value(grid):
+    """PERM has an empty line after each row and a value that is not a number, so its first layer is parsed
+    value by value"""
+    with pytest.warns(UserWarning, match=r"failed to parse value 'abc' of cell \(1, 2, 0\) in PERM"):
+        RMS_Grid().load_model_vip(vip_file)
+    perm = grid.block_dict['PERM']
+    assert perm.shape == (5, 3, 2)
+    valid = ~np.isnan(expected['block_PERM'])
+    assert valid.sum() == 5 * 3 * 2 - 1
+    assert np.array_equal(perm[valid], expected['block_PERM'][valid].astype(np.float32))
+
+
+def _coordinates_file(nx, ny, nz):
+    """Corner lines of every cell and the mean of the corners of each cell on its own"""
+    corners = np.random.default_rng(1234).random((nz, ny, nx, 4, 6)) * 1e4
+    lines = []
+    means = {key: np.empty((nx, ny, nz)) for key in ('coords_x', 'coords_y', 'coords_z')}
+    for z in range(nz):
+        lines += ['C Layer', 'C', 'C']
+        for y in range(ny):
+            for x in range(nx):
+                lines += ['C Cell'] + [' '.join(str(value) for value in corners[z, y, x, i]) for i in range(4)]
+                points = corners[z, y, x].reshape(8, 3)
+                for i, key in enumerate(means):
+                    means[key][x, y, z] = np.mean(points[:, i])
+    return lines, means
+
+
+def _livecells_file(nx, ny, nz):
+    """Rows of live cells split in lines of 8 values"""
+    live = np.random.default_rng(1234).integers(0, 2, (nx, ny, nz))
+    lines = []
+    for z in range(nz):
+        for y in range(ny):
+            lines += [' '.join(str(value) for value in live[i:i + 8, y, z]) for i in range(0, nx, 8)]
+    return lines, {'mask': live}
+
+
+@pytest.mark.parametrize('shape', [(7, 4, 3), (16, 3, 2), (11, 1, 1)])
+@pytest.mark.parametrize('parser, write', [('parse_coordinates', _coordinates_file),
+                                           ('parse_livecells_vip', _livecells_file)])
+def test_parse_synthetic(parser, write, shape):
+    """The layers parsed all at once are the same as the cells parsed one by one"""
+    lines, cells = write(*shape)
+    grid = RMS_Grid()
+    getattr(grid, parser)(io.StringIO('\n'.join(lines) + '\n'), *shape)
+    for key, values in cells.items():
+        parsed = grid.block_dict[key] if key in grid.block_dict else getattr(grid, key)
+        assert parsed.shape == shape
+        assert np.array_equal(parsed, values)
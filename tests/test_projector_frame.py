@@ -0,0 +1,13 @@
+from sandbox.projector import Projector
+import panel as pn
+
+
+def test_frame_jpeg():
+    """The projected frame is sent to the browser as a jpeg of the figure"""
+    projector = Projector(use_panel=False)
+    projector.ax.plot([10, 20, 30], [20, 39, 48])
+    projector.trigger()
+    assert isinstance(projector.frame, pn.pane.JPG)
+    assert projector.frame.object.getvalue()[:3] == b'\xff\xd8\xff'  # jpeg start of image marker
+    root = projector.frame.get_root()
+    assert (root.width, root.height) == (700, 500)
@@ -3,6 +3,7 @@ calib_dir = _test_data['test'] + 'temp/'
 from sandbox.sensor import Sensor
 import numpy as np
 import matplotlib.pyplot as plt
+import pytest
 import platform
 _platform = platform.system()
 
@@ -25,6 +26,19 @@ def test_init_dummy():
           sensor.depth[0, 0])
     #assert np.allclose(sensor.depth[0, 0], 1314.7485240531175)
 
+def test_dummy_threads():
+    """The frames of a dummy sensor are interpolated in its own threads, which end on close"""
+    sensor = Sensor(name='dummy', n_workers=2)
+    executor = sensor.Sensor._executor
+    assert sensor.get_frame().shape == (404, 492)
+    threads = set(executor._threads)
+    assert 0 < len(threads) <= 2
+    sensor.close()
+    assert sensor.Sensor._executor is None
+    assert all(not thread.is_alive() for thread in threads)
+    # without the threads the frames are interpolated in one go
+    assert sensor.get_frame().shape == (404, 492)
+
 def test_save_load_calibration_projector():
     sensor = Sensor(name='dummy')
     file = calib_dir + 'test_sensor_calibration.json'
@@ -43,6 +57,67 @@ def test_extent_property():
     print(sensor.extent)
     assert np.allclose(np.asarray([0, 492, 0, 404, 0, 800]), sensor.extent)
 
+def test_crop_frame_margins():
+    sensor = Sensor(name='dummy')
+    frame = np.arange(424 * 512).reshape(424, 512)
+    sensor.s_top, sensor.s_right, sensor.s_bottom, sensor.s_left = 0, 10, 20, 30
+    crop = sensor.crop_frame(frame)
+    assert crop.shape == (404, 472)
+    assert crop.shape == (sensor.s_frame_height, sensor.s_frame_width)
+    assert np.array_equal(crop, frame[20:, 30:-10])
+
+    sensor.s_top, sensor.s_right, sensor.s_bottom, sensor.s_left = 10, 0, 20, 30
+    crop = sensor.crop_frame(frame)
+    assert crop.shape == (394, 482)
+    assert np.array_equal(crop, frame[20:-10, 30:])
+
+def test_crop_frame_no_margins():
+    sensor = Sensor(name='dummy')
+    frame = np.arange(424 * 512).reshape(424, 512)
+    sensor.s_top, sensor.s_right, sensor.s_bottom, sensor.s_left = 0, 0, 0, 0
+    crop = sensor.crop_frame(frame)
+    assert crop.shape == (424, 512)
+    assert np.array_equal(crop, frame)
+
+def test_capture_thread_dummy():
+    sensor = Sensor(name='dummy')
+    sensor.run_capture()
+    frame = sensor.get_frame()
+    assert sensor.capture_status == 'running'
+    sensor.stop_capture()
+    assert frame.shape == (404, 492)
+    assert sensor.capture_status == 'stopped'
+
+def test_capture_thread_run_twice_dummy():
+    sensor = Sensor(name='dummy')
+    sensor.run_capture()
+    thread = sensor.capture_thread
+    sensor.run_capture()
+    # the second call keeps the running thread instead of starting another one
+    assert sensor.capture_thread is thread
+    sensor.stop_capture()
+    assert not thread.is_alive()
+    assert sensor.capture_status == 'stopped'
+
+def test_capture_thread_error_dummy():
+    sensor = Sensor(name='dummy')
+    get_raw_frame = sensor.get_raw_frame
+
+    def broken_frame(*args, **kwargs):
+        raise IOError('sensor disconnected')
+
+    sensor.get_raw_frame = broken_frame
+    sensor.run_capture()
+    # the error of the capture thread is raised by get_frame instead of blocking forever
+    with pytest.raises(IOError):
+        sensor.get_frame()
+    sensor.capture_thread.join(timeout=5)
+    assert not sensor.capture_thread.is_alive()
+    assert sensor.capture_status == 'stopped'
+    # afterwards the frames are read without the thread again
+    sensor.get_raw_frame = get_raw_frame
+    assert sensor.get_frame().shape == (404, 492)
+
 def test_get_frame():
     sensor = Sensor(name='kinect_v2', invert=False)
     print(sensor.get_frame())